@@ -0,0 +1,5 @@
+"""Benchmarks for automaton construction and matching.
+
+Run them with ``python -m benchmarks`` from the repository root and compare
+two result files with ``python -m benchmarks.compare old.json new.json``.
+"""
@@ -0,0 +1,20 @@
+import argparse
+
+from benchmarks import runner
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Times automaton construction and matching.')
+    parser.add_argument('--scale', type=int, default=1, help='multiplies the size of every input')
+    parser.add_argument('--only', help='runs only operations whose name contains this text')
+    parser.add_argument('--output', help='writes the results as JSON to this file')
+    arguments = parser.parse_args()
+
+    report = runner.run(arguments.scale, arguments.only)
+    if arguments.output:
+        runner.save(report, arguments.output)
+
+
+if __name__ == '__main__':
+    main()
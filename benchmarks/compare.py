@@ -0,0 +1,49 @@
+import argparse
+import json
+
+
+def compare(old, new, threshold=0.1):
+    """Pairs results by operation and case.
+    :param old: {dict} report of the base revision
+    :param new: {dict} report of the revision under test
+    :param threshold: {float} relative change of the median reported as a regression or improvement
+    :return: {list} of (name, case, old median, new median, ratio, verdict)
+    """
+    base = {(result['name'], result['case']): result for result in old['results']}
+    rows = []
+
+    for result in new['results']:
+        key = (result['name'], result['case'])
+        if key not in base:
+            continue
+        before = base[key]['latency']['median']
+        after = result['latency']['median']
+        ratio = after / before if before else float('inf')
+        if ratio > 1 + threshold:
+            verdict = 'slower'
+        elif ratio < 1 - threshold:
+            verdict = 'faster'
+        else:
+            verdict = ''
+        rows.append((key[0], key[1], before, after, ratio, verdict))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare',
+                                     description='Compares two files written by python -m benchmarks --output.')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    with open(arguments.old) as old_file, open(arguments.new) as new_file:
+        old, new = json.load(old_file), json.load(new_file)
+
+    print('%s -> %s' % (old.get('revision'), new.get('revision')))
+    for name, case, before, after, ratio, verdict in compare(old, new, arguments.threshold):
+        print('%-32s %-28s %12.6fs %12.6fs %7.2fx %s' % (name, case, before, after, ratio, verdict))
+
+
+if __name__ == '__main__':
+    main()
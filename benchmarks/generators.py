@@ -0,0 +1,104 @@
+import random
+import string
+
+from regular_sets.finite_automaton import NDFA
+
+
+def random_ndfa(size, symbols='ab', out_degree=2, accept_ratio=0.2, seed=0):
+    """
+    :param size: {int} number of states
+    :param symbols: {str} alphabet
+    :param out_degree: {float} expected number of next states per state and symbol
+    :param accept_ratio: {float} chance of a state being an accept state
+    :param seed: seed of the generator, so runs are comparable
+    :return: {NDFA}
+    """
+    rng = random.Random(seed)
+    states = ['q%d' % i for i in range(size)]
+    delta = {}
+
+    for _state in states:
+        delta[_state] = {}
+        for symbol in symbols:
+            next_states = {target for target in states if rng.random() < out_degree / size}
+            if next_states:
+                delta[_state][symbol] = next_states
+
+    accept_states = [_state for _state in states if rng.random() < accept_ratio] or [states[-1]]
+    return NDFA(delta, states[0], accept_states)
+
+
+def nth_symbol_from_end(n):
+    """Classic worst case of the subset construction: its minimal DFA has 2^n states.
+        L = {w | w ∈ Σ*={a, b} and the n-th symbol from the end is 'a'}
+
+    :param n: {int} position from the end
+    :return: {NDFA} with n + 1 states
+    """
+    delta = {'q0': {'a': {'q0', 'q1'}, 'b': {'q0'}}}
+    for i in range(1, n):
+        delta['q%d' % i] = {'a': {'q%d' % (i + 1)}, 'b': {'q%d' % (i + 1)}}
+    delta['q%d' % n] = {}
+    return NDFA(delta, 'q0', ['q%d' % n])
+
+
+def sparse_chain(size, symbols='ab'):
+    """Cycle of states where every symbol moves to the next state, so a
+    simulation has a single active state however large the automaton is.
+
+    :param size: {int} number of states
+    :param symbols: {str} alphabet
+    :return: {NDFA}
+    """
+    delta = {'q%d' % i: {symbol: {'q%d' % ((i + 1) % size)} for symbol in symbols} for i in range(size)}
+    return NDFA(delta, 'q0', ['q%d' % (size - 1)])
+
+
+def epsilon_heavy(size, seed=0):
+    """Chain of states where every state has '&' transitions forward and back,
+    so closures are large and overlapping.
+
+    :param size: {int} number of states
+    :param seed: seed of the generator
+    :return: {NDFA}
+    """
+    rng = random.Random(seed)
+    states = ['q%d' % i for i in range(size)]
+    delta = {}
+
+    for i, _state in enumerate(states):
+        epsilon = {states[min(i + 1, size - 1)], states[rng.randrange(size)]}
+        delta[_state] = {'&': epsilon, rng.choice('ab'): {states[rng.randrange(size)]}}
+    return NDFA(delta, states[0], [states[-1]])
+
+
+def large_grammar(productions, seed=0):
+    """Grammar text in the format read by make_it_proper_to_grammar.
+    :param productions: {int} number of alternatives over all non-terminals
+    :param seed: seed of the generator
+    :return: {str}
+    """
+    rng = random.Random(seed)
+    non_terminals = ['S'] + [symbol for symbol in string.ascii_uppercase if symbol != 'S']
+    terminals = string.ascii_lowercase
+    per_head = max(productions // len(non_terminals), 1)
+
+    rules = []
+    for head in non_terminals:
+        alternatives = []
+        for _ in range(per_head):
+            terminal = rng.choice(terminals)
+            if rng.random() < 0.1:
+                alternatives.append(terminal)
+            else:
+                alternatives.append(terminal + rng.choice(non_terminals))
+        rules.append('%s -> %s' % (head, ' | '.join(alternatives)))
+    return ' '.join(rules)
+
+
+def random_sentences(count, length, symbols='ab', seed=0):
+    """
+    :return: {list} of count sentences of the given length
+    """
+    rng = random.Random(seed)
+    return [''.join(rng.choice(symbols) for _ in range(length)) for _ in range(count)]
@@ -0,0 +1,197 @@
+import gc
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from benchmarks import generators
+from regular_sets import regular_grammar
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(name, case, operation, repeat=5, work=1, unit='op'):
+    """Times operation and traces the peak memory of one extra run.
+    :param name: {str} operation measured
+    :param case: {str} input of the operation
+    :param operation: callable without arguments
+    :param repeat: {int} timed runs
+    :param work: {int} units of work done by one run, for the throughput
+    :param unit: {str} name of a unit of work
+    :return: {dict} result
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    median = _percentile(timings, 0.5)
+    return {
+        'name': name,
+        'case': case,
+        'repeat': repeat,
+        'latency': {
+            'min': timings[0],
+            'median': median,
+            'mean': sum(timings) / len(timings),
+            'p95': _percentile(timings, 0.95),
+        },
+        'throughput': work / median if median else None,
+        'unit': unit,
+        'peak_memory': peak,
+    }
+
+
+class _SetSimulation:
+    """NDFA simulation over sets of state names, without '&' transitions,
+    the reference the bitset table is measured against."""
+
+    def __init__(self, ndfa):
+        self.delta = ndfa.delta
+        self.initial_state = ndfa.initial_state
+        self.accept_states = ndfa.accept_states
+
+    def validate_sentence(self, input_string):
+        _states = {self.initial_state}
+        for a in input_string:
+            new_states = set()
+            for _state in _states:
+                new_states |= self.delta.get(_state, {}).get(a, set())
+            _states = new_states
+        return not _states.isdisjoint(self.accept_states)
+
+
+def _matching(automaton, label, kind, sentences, repeat):
+    validate_sentence = automaton.validate_sentence
+    symbols = sum(len(sentence) for sentence in sentences)
+
+    def run():
+        for sentence in sentences:
+            validate_sentence(sentence)
+
+    return measure(kind + '.validate_sentence', label, run, repeat, symbols, 'symbol')
+
+
+def cases(scale=1, only=None):
+    """Inputs an operation needs are only built if the operation is selected.
+    :param scale: {int} multiplies the size of every input
+    :param only: {str} runs only operations whose name contains it
+    :return: generator of results
+    """
+    def selected(*names):
+        return any(not only or only in name for name in names)
+
+    sentences = generators.random_sentences(200 * scale, 200)
+
+    for n in (8, 10 + 2 * scale):
+        ndfa = generators.nth_symbol_from_end(n)
+        label = 'nth_symbol_from_end(%d)' % n
+        if selected('NDFA.determinization'):
+            yield measure('NDFA.determinization', label, ndfa.determinization)
+        if selected('NDFA.validate_sentence'):
+            yield _matching(ndfa, label, 'NDFA', sentences, 3)
+        if not selected('DFA.minimize', 'DFA.to_grammar', 'DFA.validate_sentence'):
+            continue
+        dfa = ndfa.determinization()
+        if selected('DFA.minimize'):
+            yield measure('DFA.minimize', label, dfa.minimize)
+        if selected('DFA.to_grammar'):
+            yield measure('DFA.to_grammar', label, dfa.to_grammar)
+        if selected('DFA.validate_sentence'):
+            yield _matching(dfa, label, 'DFA', sentences, 3)
+
+    if selected('NDFA.compile', 'NDFA.validate_sentence', 'NDFA.sets.validate_sentence'):
+        for size in (50 * scale, 200 * scale):
+            ndfa = generators.random_ndfa(size)
+            label = 'random_ndfa(%d)' % size
+            if selected('NDFA.compile'):
+                yield measure('NDFA.compile', label, ndfa.compile)
+            if selected('NDFA.validate_sentence'):
+                yield _matching(ndfa, label, 'NDFA', sentences, 3)
+            if selected('NDFA.sets.validate_sentence'):
+                yield _matching(_SetSimulation(ndfa), label, 'NDFA.sets', sentences, 3)
+
+    if selected('NDFA.validate_sentence', 'NDFA.sets.validate_sentence'):
+        for size in (2000 * scale, 8000 * scale):
+            ndfa = generators.sparse_chain(size)
+            label = 'sparse_chain(%d)' % size
+            if selected('NDFA.validate_sentence'):
+                yield _matching(ndfa, label, 'NDFA', sentences, 3)
+            if selected('NDFA.sets.validate_sentence'):
+                yield _matching(_SetSimulation(ndfa), label, 'NDFA.sets', sentences, 3)
+
+    if selected('NDFA.compile', 'NDFA.determinization', 'NDFA.validate_sentence'):
+        ndfa = generators.epsilon_heavy(300 * scale)
+        label = 'epsilon_heavy(%d)' % (300 * scale)
+        if selected('NDFA.compile'):
+            yield measure('NDFA.compile', label, ndfa.compile)
+        if selected('NDFA.determinization'):
+            yield measure('NDFA.determinization', label, ndfa.determinization, repeat=3)
+        if selected('NDFA.validate_sentence'):
+            yield _matching(ndfa, label, 'NDFA', sentences, 3)
+
+    if selected('make_it_proper_to_grammar', 'regular_grammar.to_automata', 'regular_grammar.compile'):
+        text = generators.large_grammar(5000 * scale)
+        label = 'large_grammar(%d)' % (5000 * scale)
+        if selected('make_it_proper_to_grammar'):
+            yield measure('make_it_proper_to_grammar', label,
+                          lambda: regular_grammar.make_it_proper_to_grammar(text), work=len(text), unit='char')
+        if selected('regular_grammar.to_automata', 'regular_grammar.compile'):
+            grammar = regular_grammar.make_it_proper_to_grammar(text)
+            if selected('regular_grammar.to_automata'):
+                yield measure('regular_grammar.to_automata', label, grammar.to_automata)
+            if selected('regular_grammar.compile'):
+                yield measure('regular_grammar.compile', label, grammar.compile, repeat=3)
+
+
+def revision():
+    """
+    :return: {str} git revision of the working tree, None outside a git checkout
+    """
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('ascii').strip()
+
+
+def run(scale=1, only=None):
+    """
+    :param scale: {int} multiplies the size of every input
+    :param only: {str} runs only operations whose name contains it
+    :return: {dict} machine-readable report
+    """
+    results = []
+    for result in cases(scale, only):
+        results.append(result)
+        print('%-32s %-28s %12.6fs  %14s  %10d B' % (
+            result['name'], result['case'], result['latency']['median'],
+            '%.0f %s/s' % (result['throughput'], result['unit']) if result['throughput'] else '-',
+            result['peak_memory']))
+
+    return {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'scale': scale,
+        'results': results,
+    }
+
+
+def save(report, path):
+    with open(path, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
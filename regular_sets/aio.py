@@ -0,0 +1,104 @@
+# asyncio front end of Matcher, async and await need Python 3.5 or later
+import asyncio
+import codecs
+
+from regular_sets.matcher import Matcher
+
+CHUNK_SIZE = 1 << 16
+
+
+class AsyncMatcher(Matcher):
+    """Validates one sentence read from an asyncio stream.
+
+    Chunks are stepped through the shared engine as they arrive and only the
+    current state, plus a pending partial character for byte streams, is
+    kept per stream. Each chunk is computed without yielding to the event
+    loop, so chunk_size bounds the time a stream holds it.
+    """
+
+    def __init__(self, engine, encoding='utf-8'):
+        """AsyncMatcher Constructor
+        :param engine: {CompiledDFA}, {CompiledNDFA} or {LazyDFA}
+        :param encoding: {str} text encoding of byte chunks
+        """
+        super().__init__(engine)
+        self.encoding = encoding
+        self.decoder = None
+
+    def feed(self, chunk):
+        """
+        :param chunk: next part of the sentence, {str} or {bytes} in the matcher's encoding
+        :return: {AsyncMatcher} self, so calls can be chained
+        """
+        if isinstance(chunk, (bytes, bytearray)):
+            if self.decoder is None:
+                self.decoder = codecs.getincrementaldecoder(self.encoding)()
+            chunk = self.decoder.decode(chunk)
+        return super().feed(chunk)
+
+    def close(self):
+        """Flushes the decoder at the end of a byte stream
+        :raise UnicodeDecodeError: if the stream ends inside a character
+        """
+        if self.decoder is not None:
+            super().feed(self.decoder.decode(b'', final=True))
+            self.decoder = None
+
+    def reset(self):
+        """Starts a new sentence"""
+        super().reset()
+        self.decoder = None
+
+    def is_dead(self):
+        """
+        :return: True, if no continuation of the sentence fed so far is valid
+        """
+        return self.engine.is_dead(self.state)
+
+    async def consume(self, chunks, drain=False):
+        """
+        :param chunks: async iterable of {str} or {bytes} chunks of one sentence
+        :param drain: if False, stop reading as soon as the sentence can't be valid anymore
+        :return: True, if the sentence is valid
+                 False, otherwise
+        """
+        async for chunk in chunks:
+            self.feed(chunk)
+            if not drain and self.is_dead():
+                return False
+        self.close()
+        return self.accepts()
+
+    async def consume_reader(self, reader, chunk_size=CHUNK_SIZE, drain=False):
+        """
+        :param reader: {asyncio.StreamReader} read until end of file
+        :param chunk_size: {int} bytes read at a time
+        :param drain: if False, stop reading as soon as the sentence can't be valid anymore
+        :return: True, if the sentence is valid
+                 False, otherwise
+        """
+        while True:
+            chunk = await reader.read(chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+            if not drain and self.is_dead():
+                return False
+        self.close()
+        return self.accepts()
+
+
+async def validate_stream(automaton, source, encoding='utf-8', chunk_size=CHUNK_SIZE, drain=False):
+    """
+    :param automaton: {DFA} or {NDFA}
+    :param source: {asyncio.StreamReader}, or async iterable of {str} or {bytes} chunks
+    :param encoding: {str} text encoding of byte chunks
+    :param chunk_size: {int} bytes read at a time from a StreamReader
+    :param drain: if False, stop reading as soon as the sentence can't be valid anymore
+    :return: True, if the sentence read from source is valid
+             False, otherwise
+    """
+    matcher = AsyncMatcher(automaton._engine(), encoding)
+    if isinstance(source, asyncio.StreamReader):
+        return await matcher.consume_reader(source, chunk_size, drain)
+    return await matcher.consume(source, drain)
@@ -0,0 +1,90 @@
+import asyncio
+import sys
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.finite_automaton import DFA
+
+if sys.version_info >= (3, 5):
+    from regular_sets.aio import AsyncMatcher, validate_stream
+
+
+class _Chunks:
+    """async iterable over a list of chunks, counting the chunks read"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.read = 0
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = asyncio.get_event_loop().create_future()
+        try:
+            future.set_result(next(self.chunks))
+            self.read += 1
+        except StopIteration:
+            future.set_exception(StopAsyncIteration())
+        return future
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'async and await need Python 3.5')
+class AsyncMatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.dfa = fixtures_test.even_length()
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_until_complete(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_async_iterable_of_str(self):
+        self.assertTrue(self.run_until_complete(validate_stream(self.dfa, _Chunks(['ab', 'a', 'b']))))
+        self.assertFalse(self.run_until_complete(validate_stream(self.dfa, _Chunks(['ab', 'a']))))
+        self.assertTrue(self.run_until_complete(validate_stream(self.ndfa, _Chunks(['a', 'ba', 'b']))))
+
+    def test_stops_reading_once_rejected(self):
+        chunks = _Chunks(['ab', 'c', 'ab', 'ab'])
+
+        self.assertFalse(self.run_until_complete(validate_stream(self.dfa, chunks)))
+        self.assertEqual(2, chunks.read)
+
+        chunks = _Chunks(['ab', 'c', 'ab', 'ab'])
+        self.assertFalse(self.run_until_complete(validate_stream(self.dfa, chunks, drain=True)))
+        self.assertEqual(4, chunks.read)
+
+    def test_stream_reader_split_inside_a_character(self):
+        dfa = DFA({'q0': {'ç': {'q1'}}, 'q1': {'ã': {'q0'}}}, 'q0', ['q0'])
+        data = 'çãçã'.encode('utf-8')
+        reader = asyncio.StreamReader(loop=self.loop)
+        reader.feed_data(data)
+        reader.feed_eof()
+
+        self.assertTrue(self.run_until_complete(validate_stream(dfa, reader, chunk_size=3)))
+
+    def test_many_streams_share_the_engine(self):
+        sentences = ['', 'a', 'ab', 'aba', 'abab', 'ba' * 100]
+
+        async_results = self.run_until_complete(asyncio.gather(
+            *[validate_stream(self.ndfa, _Chunks([sentence[:3], sentence[3:]])) for sentence in sentences]))
+
+        self.assertEqual([self.ndfa.validate_sentence(sentence) for sentence in sentences], async_results)
+
+    def test_matcher_state(self):
+        matcher = AsyncMatcher(self.dfa._engine())
+
+        self.assertTrue(matcher.feed(b'a').feed('b').accepts())
+        self.assertFalse(matcher.feed('c').accepts())
+        self.assertTrue(matcher.is_dead())
+        matcher.reset()
+        self.assertTrue(matcher.accepts())
+
+
+if __name__ == '__main__':
+    unittest.main()
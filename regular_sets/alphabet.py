@@ -0,0 +1,352 @@
+from bisect import bisect_left, bisect_right
+
+MAX_CODE_POINT = 0x110000
+
+# where the symbols of an interval come from, in order of precedence
+LITERAL = 0
+RANGE = 1
+UNCOVERED = 2
+
+
+def _is_character(symbol):
+    return isinstance(symbol, str) and len(symbol) == 1
+
+
+class SymbolRange:
+    """Transition label matching every character from first to last, both included."""
+
+    __slots__ = ('first', 'last')
+
+    def __init__(self, first, last):
+        """SymbolRange Constructor
+        :param first: {str} first character of the range
+        :param last: {str} last character of the range
+        """
+        if not (_is_character(first) and _is_character(last)) or first > last:
+            raise ValueError('invalid symbol range %r-%r' % (first, last))
+        self.first = first
+        self.last = last
+
+    def __contains__(self, symbol):
+        return _is_character(symbol) and self.first <= symbol <= self.last
+
+    def __eq__(self, other):
+        return isinstance(other, SymbolRange) and self.first == other.first and self.last == other.last
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((SymbolRange, self.first, self.last))
+
+    def __repr__(self):
+        return 'SymbolRange(%r, %r)' % (self.first, self.last)
+
+
+class _Other:
+    """Transition label matching every symbol without a label of its own in the state."""
+
+    def __repr__(self):
+        return 'OTHER'
+
+    def __reduce__(self):  # unpickles to the same object
+        return 'OTHER'
+
+
+OTHER = _Other()
+
+
+def sentence(symbols):
+    """
+    :param symbols: {list} symbols in reading order
+    :return: {str} when every symbol is a character, otherwise {tuple} of the symbols,
+        so that validate_sentence reads back the same symbols
+    """
+    if all(_is_character(symbol) for symbol in symbols):
+        return ''.join(symbols)
+    return tuple(symbols)
+
+
+def _resolve(parts, point, union):
+    """
+    :param parts: {tuple} (literals, ranges, other, tokens) of one state
+    :param point: {int} code point
+    :param union: if True, every label matching point contributes to the target
+    :return: target of point in the state
+    """
+    literals, ranges, other, _ = parts
+    if union:
+        found = point in literals
+        target = literals.get(point, 0)
+        for first, last, mask in ranges:
+            if first <= point <= last:
+                target |= mask
+                found = True
+        return target if found else other
+
+    if point in literals:
+        return literals[point]
+    for first, last, target in ranges:
+        if first <= point <= last:
+            return target
+    return other
+
+
+def _interner(signatures, dead):
+    """
+    :param signatures: {list} receives each new signature, its position is its column
+    :param dead: target meaning no transition
+    :return: callable, returns the column of a signature, None if every target in it is dead
+    """
+    columns = {}
+
+    def intern(signature):
+        if all(target == dead for target in signature):
+            return None
+        column = columns.get(signature)
+        if column is None:
+            column = columns[signature] = len(signatures)
+            signatures.append(signature)
+        return column
+
+    return intern
+
+
+class SymbolClasses:
+    """Partition of the input symbols into classes an automaton cannot tell apart,
+    each class being one column of a transition table.
+
+    Characters are split into intervals of code points at the bounds of every
+    label. Each interval, each label that isn't a single character and the
+    symbols no label mentions have the column of their class, or None when no
+    state has a transition for them. Code points below 256 are looked up in a
+    flat list and every character classified is memoized in index.
+    """
+
+    def __init__(self, boundaries, columns, kinds, tokens, unknown):
+        """SymbolClasses Constructor
+        :param boundaries: {list} first code point of each interval, the first one is 0
+        :param columns: {list} column of each interval
+        :param kinds: {list} LITERAL, RANGE or UNCOVERED for each interval, the labels it comes from
+        :param tokens: {dict} column of each label that isn't a single character
+        :param unknown: column of the symbols no label mentions
+        """
+        self.boundaries = boundaries
+        self.columns = columns
+        self.kinds = kinds
+        self.tokens = tokens
+        self.unknown = unknown
+        self._index()
+
+    def _index(self):
+        used = [column for column in self.columns + list(self.tokens.values()) + [self.unknown]
+                if column is not None]
+        self.count = max(used) + 1 if used else 0
+        self.byte_columns = [self.columns[bisect_right(self.boundaries, point) - 1] for point in range(256)]
+
+        self.index = {token: column for token, column in self.tokens.items() if column is not None}
+        for point, column, kind in zip(self.boundaries, self.columns, self.kinds):
+            if kind == LITERAL and column is not None:
+                self.index[chr(point)] = column
+
+        self.labels, self.dead_labels = self._labels()
+        self.representatives = [None] * self.count
+        for kind in (LITERAL, RANGE, UNCOVERED):  # prefer symbols the automaton mentions
+            for point, column, interval_kind in zip(self.boundaries, self.columns, self.kinds):
+                if interval_kind == kind and column is not None and self.representatives[column] is None:
+                    self.representatives[column] = chr(point)
+        for token, column in self.tokens.items():
+            if column is not None and self.representatives[column] is None:
+                self.representatives[column] = token
+
+    def _labels(self):
+        """
+        :return: {tuple} ({list} of labels per column, {list} of labels of the dead class)
+        """
+        labels = [[] for _ in range(self.count)]
+        dead_labels = []
+
+        def add(column, label):
+            (dead_labels if column is None else labels[column]).append(label)
+
+        def close(span):
+            if span is not None:
+                column, first, last = span
+                add(column, chr(first) if first == last else SymbolRange(chr(first), chr(last)))
+
+        span = None  # (column, first, last) of the range being merged
+        ends = self.boundaries[1:] + [MAX_CODE_POINT]
+        for first, end, column, kind in zip(self.boundaries, ends, self.columns, self.kinds):
+            if kind == RANGE and span is not None and span[0] == column:
+                span = (column, span[1], end - 1)
+                continue
+            close(span)
+            span = None
+            if kind == RANGE:
+                span = (column, first, end - 1)
+            elif kind == LITERAL:
+                add(column, chr(first))
+        close(span)
+
+        for token, column in self.tokens.items():
+            add(column, token)
+        if self.unknown is not None:
+            labels[self.unknown].append(OTHER)
+        return labels, dead_labels
+
+    def __getstate__(self):  # the lookups are rebuilt, not pickled
+        return self.boundaries, self.columns, self.kinds, self.tokens, self.unknown
+
+    def __setstate__(self, state):
+        self.boundaries, self.columns, self.kinds, self.tokens, self.unknown = state
+        self._index()
+
+    def classify(self, symbol):
+        """
+        :param symbol: input symbol
+        :return: {int} column of the class of symbol, None if no state has a transition for it
+        """
+        column = self.index.get(symbol)
+        if column is not None:
+            return column
+        if not _is_character(symbol):
+            return self.tokens.get(symbol, self.unknown)
+
+        point = ord(symbol)
+        if point < 256:
+            column = self.byte_columns[point]
+        else:
+            column = self.columns[bisect_right(self.boundaries, point) - 1]
+        if column is not None:
+            self.index[symbol] = column
+        return column
+
+    def transitions(self, targets, empty):
+        """Labels the targets of one state of a table over these classes
+        :param targets: {list} target of each column, None where there is no transition
+        :param empty: target for the symbols without transition when the state has an OTHER one
+        :return: {dict} label -> target
+        """
+        other = self.unknown is not None and targets[self.unknown] is not None
+        transitions = {}
+        for column, target in enumerate(targets):
+            if target is None and not other:
+                continue
+            for label in self.labels[column]:
+                transitions[label] = empty if target is None else target
+        if other:
+            for label in self.dead_labels:
+                transitions[label] = empty
+        return transitions
+
+    def to_json(self):
+        """
+        :return: {dict} JSON-serializable form, labels that aren't characters must be too
+        """
+        return {'boundaries': self.boundaries, 'columns': self.columns, 'kinds': self.kinds,
+                'tokens': [[token, column] for token, column in self.tokens.items()], 'unknown': self.unknown}
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        :param data: {dict} written by to_json
+        :return: {SymbolClasses}
+        """
+        return cls(data['boundaries'], data['columns'], data['kinds'],
+                   {token: column for token, column in data['tokens']}, data['unknown'])
+
+    @classmethod
+    def build(cls, rows, union=False):
+        """Classes of the symbols by the target each state gives them
+
+        The {DFA} rule picks a single-character label over a range and a range
+        over OTHER. With union, the {NDFA} rule, every label matching a symbol
+        contributes, and OTHER only applies to symbols without any.
+
+        :param rows: {list} per state, {dict} label -> target; a target is a state number
+            or None, with union a mask of states
+        :param union: if True, targets are masks OR-ed together
+        :return: {tuple} ({SymbolClasses}, {list} per column, the tuple of targets of every state)
+        """
+        dead = 0 if union else None
+        parsed = []
+        points = {0}
+        literal_points = set()
+        spans = []
+        tokens = []
+        seen_tokens = set()
+
+        for transitions in rows:
+            literals = {}
+            ranges = []
+            other = dead
+            own_tokens = {}
+            for label, target in transitions.items():
+                if _is_character(label):
+                    point = ord(label)
+                    literals[point] = target
+                    literal_points.add(point)
+                    points.update((point, point + 1))
+                elif isinstance(label, SymbolRange):
+                    first, last = ord(label.first), ord(label.last)
+                    ranges.append((first, last, target))
+                    spans.append((first, last))
+                    points.update((first, last + 1))
+                elif label is OTHER:
+                    other = target
+                else:
+                    if label not in seen_tokens:
+                        seen_tokens.add(label)
+                        tokens.append(label)
+                    own_tokens[label] = target
+            parsed.append((literals, ranges, other, own_tokens))
+
+        points.discard(MAX_CODE_POINT)
+        boundaries = sorted(points)
+        covering = [0] * (len(boundaries) + 1)  # ranges opening minus ranges closing at each interval
+        for first, last in spans:
+            covering[bisect_left(boundaries, first)] += 1
+            covering[bisect_left(boundaries, last + 1)] -= 1
+
+        signatures = []
+        intern = _interner(signatures, dead)
+        unknown = intern(tuple(parts[2] for parts in parsed))
+        columns = []
+        kinds = []
+        depth = 0
+        for i, point in enumerate(boundaries):
+            depth += covering[i]
+            kind = LITERAL if point in literal_points else RANGE if depth else UNCOVERED
+            kinds.append(kind)
+            if kind == UNCOVERED:  # only OTHER can match
+                columns.append(unknown)
+            else:
+                columns.append(intern(tuple(_resolve(parts, point, union) for parts in parsed)))
+
+        token_columns = {token: intern(tuple(parts[3].get(token, parts[2]) for parts in parsed))
+                         for token in tokens}
+        return cls(boundaries, columns, kinds, token_columns, unknown), signatures
+
+    @classmethod
+    def product(cls, parts):
+        """Common refinement of several partitions
+        :param parts: {list} of {SymbolClasses}
+        :return: {tuple} ({SymbolClasses}, {list} per column, the tuple of the columns in every part)
+        """
+        boundaries = sorted(set().union(*(part.boundaries for part in parts)))
+        signatures = []
+        intern = _interner(signatures, None)
+        columns = []
+        kinds = []
+        for point in boundaries:
+            located = [(part, bisect_right(part.boundaries, point) - 1) for part in parts]
+            columns.append(intern(tuple(part.columns[i] for part, i in located)))
+            kinds.append(min(part.kinds[i] for part, i in located))
+
+        tokens = {}
+        for part in parts:
+            for token in part.tokens:
+                if token not in tokens:
+                    tokens[token] = intern(tuple(other.classify(token) for other in parts))
+        unknown = intern(tuple(part.unknown for part in parts))
+        return cls(boundaries, columns, kinds, tokens, unknown), signatures
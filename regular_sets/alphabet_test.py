@@ -0,0 +1,123 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from regular_sets.alphabet import OTHER, SymbolClasses, SymbolRange
+from regular_sets.equivalence import equivalent
+from regular_sets.finite_automaton import DFA, NDFA
+
+
+class SymbolClassesTests(unittest.TestCase):
+    def test_symbols_with_same_targets_share_a_column(self):
+        classes, signatures = SymbolClasses.build([{'a': 1, 'b': 1, 'c': 0}, {'a': 0, 'b': 0}])
+
+        self.assertEqual(2, classes.count)
+        self.assertEqual(classes.classify('a'), classes.classify('b'))
+        self.assertNotEqual(classes.classify('a'), classes.classify('c'))
+        self.assertIsNone(classes.classify('d'))
+        self.assertEqual((1, 0), signatures[classes.classify('a')])
+        self.assertEqual((0, None), signatures[classes.classify('c')])
+
+    def test_literal_over_range_over_other(self):
+        classes, signatures = SymbolClasses.build([{SymbolRange('a', 'z'): 1, 'e': 2, OTHER: 3}])
+
+        self.assertEqual((1,), signatures[classes.classify('a')])
+        self.assertEqual((2,), signatures[classes.classify('e')])
+        self.assertEqual((3,), signatures[classes.classify('0')])
+        self.assertEqual((3,), signatures[classes.classify('中')])
+        self.assertEqual((3,), signatures[classes.classify('word')])
+
+    def test_union_of_matching_labels(self):
+        classes, signatures = SymbolClasses.build([{SymbolRange('a', 'm'): 0b01, SymbolRange('k', 'z'): 0b10,
+                                                    'c': 0, OTHER: 0b100}], union=True)
+
+        self.assertEqual((0b01,), signatures[classes.classify('b')])
+        self.assertEqual((0b11,), signatures[classes.classify('l')])
+        self.assertEqual((0b01,), signatures[classes.classify('c')])
+        self.assertEqual((0b10,), signatures[classes.classify('y')])
+        self.assertEqual((0b100,), signatures[classes.classify('!')])
+
+    def test_unicode_range_is_one_column(self):
+        dfa = DFA({'q0': {SymbolRange('\u0000', '\U0010ffff'): {'q0'}}}, 'q0', ['q0'])
+        compiled = dfa.compile()
+
+        self.assertEqual(1, compiled.classes.count)
+        self.assertEqual(2, len(compiled.table))
+        self.assertTrue(dfa.validate_sentence('ç中\U0001f600a'))
+
+    def test_other_label_is_a_singleton(self):
+        self.assertIs(OTHER, pickle.loads(pickle.dumps(OTHER)))
+        self.assertEqual(SymbolRange('a', 'f'), pickle.loads(pickle.dumps(SymbolRange('a', 'f'))))
+        self.assertRaises(ValueError, SymbolRange, 'z', 'a')
+
+
+class RangeAutomatonTests(unittest.TestCase):
+    def setUp(self):
+        """delta table
+           L = { identifiers: a letter followed by letters, digits or '_' }
+
+           delta |  a-z  |  0-9  |   _   |
+           ------|-------|-------|-------|
+            ->q0 |   q1  |   -   |   -   |
+             *q1 |   q1  |   q1  |   q1  |
+           ------------------------------|
+        """
+        self.dfa = DFA({'q0': {SymbolRange('a', 'z'): {'q1'}},
+                        'q1': {SymbolRange('a', 'z'): {'q1'}, SymbolRange('0', '9'): {'q1'}, '_': {'q1'}}},
+                       'q0', ['q1'])
+        self.sentences = ['', 'x', 'x1', 'snake_case', '1x', 'a-b', 'café']
+
+    def test_validate_sentence(self):
+        self.assertEqual([False, True, True, True, False, False, False],
+                         [self.dfa.validate_sentence(sentence) for sentence in self.sentences])
+
+    def test_compiled_table_has_a_column_per_class(self):
+        compiled = self.dfa.compile()
+
+        self.assertEqual(2, compiled.classes.count)  # letters, then digits and '_' together
+        self.assertEqual(compiled.classes.classify('a'), compiled.classes.classify('q'))
+        self.assertEqual(compiled.classes.classify('_'), compiled.classes.classify('7'))
+
+    def test_minimize_keeps_the_labels(self):
+        minimal = self.dfa.minimize()
+
+        self.assertEqual({SymbolRange('a', 'z'): {'q1'}}, minimal.delta['q0'])
+        self.assertEqual({SymbolRange('0', '9'), '_', SymbolRange('a', 'z')}, set(minimal.delta['q1']))
+
+    def test_determinization_over_ranges_and_other(self):
+        """delta table
+           L = { sentences ending with 'ab' }
+
+           delta |   a   |   b   | OTHER |
+           ------|-------|-------|-------|
+            ->q0 | q0,q1 |   -   |  q0   |
+              q1 |   -   |  q2   |   -   |
+             *q2 |   -   |   -   |   -   |
+           ------------------------------|
+        """
+        ndfa = NDFA({'q0': {'a': {'q0', 'q1'}, OTHER: {'q0'}}, 'q1': {'b': {'q2'}}, 'q2': {}}, 'q0', ['q2'])
+        dfa = ndfa.determinization()
+
+        for sentence in ['ab', 'xyzab', '中ab', 'aab', 'abx', 'a', '']:
+            self.assertEqual(sentence.endswith('ab'), ndfa.validate_sentence(sentence))
+            self.assertEqual(sentence.endswith('ab'), dfa.validate_sentence(sentence))
+        self.assertTrue(equivalent(ndfa, dfa))
+        self.assertIn(OTHER, dfa.delta[dfa.initial_state])
+
+    def test_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'identifier.rdfa')
+            self.dfa.save(path)
+            loaded = DFA.load(path)
+
+            self.assertEqual([self.dfa.validate_sentence(s) for s in self.sentences],
+                             [loaded.validate_sentence(s) for s in self.sentences])
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
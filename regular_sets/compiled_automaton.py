@@ -0,0 +1,939 @@
+from array import array
+from mmap import ACCESS_READ, mmap as memory_map
+import json
+import struct
+import sys
+
+from regular_sets.alphabet import SymbolClasses
+from regular_sets.stats import phase
+
+EPSILON = '&'
+PROGRESS_INTERVAL = 1024
+
+MAGIC = b'RDFA'
+FORMAT_VERSION = 3
+HEADER = struct.Struct('<4sHHIIII')  # magic, version, flags, states, columns, initial, names size
+FROZENSET_STATES = 1
+ENCODED_NAMES = 2  # some state or symbol is a tuple or frozenset, see _encode_name
+SPARSE_GROUPS = 4  # groups of 8 states CompiledNDFA.step finds one at a time before walking every group
+
+
+def _align(offset):
+    return (offset + 3) & ~3
+
+
+def _encode_name(name):
+    """
+    :param name: state name or symbol label
+    :return: JSON value _decode_name turns back into name; lists and objects,
+        which can't be names, stand for tuples and frozensets
+    :raise ValueError: when name is not a string, number, bool, None, or a
+        tuple or frozenset of those
+    """
+    if isinstance(name, tuple):
+        return [_encode_name(part) for part in name]
+    if isinstance(name, frozenset):
+        return {'frozenset': _encode_members(name)}
+    if name is None or isinstance(name, (str, int, float)):
+        return name
+    raise ValueError('cannot save the state or symbol %r' % (name,))
+
+
+def _encode_members(_state):
+    return sorted((_encode_name(member) for member in _state), key=json.dumps)
+
+
+def _decode_name(value):
+    if isinstance(value, list):
+        return tuple(_decode_name(part) for part in value)
+    if isinstance(value, dict):
+        return frozenset(_decode_name(member) for member in value['frozenset'])
+    return value
+
+
+def _int32_array(data):
+    table = array('i')
+    table.frombytes(data)
+    if sys.byteorder == 'big':
+        table.byteswap()
+    return table
+
+
+def _fill(row, bits):
+    """Fills the successors of a combination of states of a group, and of the
+    combinations it is made of, from the successors of single states.
+
+    :param row: {list} successor mask per combination of active states of the group
+    :param bits: {int} combination, active bits of the group
+    :return: {int} successors of bits
+    """
+    low = bits & -bits
+    rest = bits ^ low
+    mask = row[low]
+    if rest:
+        successors = row[rest]
+        mask |= _fill(row, rest) if successors is None else successors
+    row[bits] = mask
+    return mask
+
+
+def epsilon_closures(size, epsilon_edges):
+    """Epsilon closure of every state, through the condensation of the epsilon graph.
+    States in the same strongly connected component share one closure, and
+    components are closed in reverse topological order (as Tarjan emits them),
+    so each closure is the OR of its members and of already closed successors.
+
+    :param size: {int} number of states
+    :param epsilon_edges: {list} of (source, target) state numbers
+    :return: {list} closure mask per state
+    """
+    successors = [[] for _ in range(size)]
+    for source, target in epsilon_edges:
+        successors[source].append(target)
+
+    closure = [1 << i for i in range(size)]
+    index = [-1] * size
+    low = [0] * size
+    on_stack = [False] * size
+    stack = []
+    counter = 0
+
+    for root in range(size):
+        if index[root] != -1 or not successors[root]:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(successors[root]))]
+
+        while work:
+            v, children = work[-1]
+            for w in children:
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(successors[w])))
+                    break
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:  # v is the root of a component
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    mask = 0
+                    for w in component:
+                        mask |= 1 << w
+                        for x in successors[w]:
+                            mask |= closure[x]
+                    for w in component:
+                        closure[w] = mask
+
+    return closure
+
+
+class CompiledDFA:
+    """Integer-indexed transition table of a DFA.
+
+    States are numbered in delta order, symbols the automaton cannot tell
+    apart share a column, and the transitions are stored row by row in a flat
+    {array}. Every undefined transition goes to an explicit dead state, which
+    is always the last row of the table.
+    """
+
+    def __init__(self, states, classes, table, accepting, initial, live=None):
+        """CompiledDFA Constructor
+        :param states: {list} state names, indexed by state number
+        :param classes: {SymbolClasses} input symbol classes, indexed by column number
+        :param table: {array} flat transition table with len(states) + 1 rows
+        :param accepting: {bytearray} 1 for each accept state number, dead state included
+        :param initial: {int} initial state number
+        :param live: {bytearray} optional, 1 for each state number that can reach an
+            accept state, computed from the table when not given
+        """
+        self.states = states
+        self.classes = classes
+        self.table = table
+        self.accepting = accepting
+        self.initial = initial
+        self.dead = len(states)
+        self.live = self._live() if live is None else live
+        self._index()
+
+    def _index(self):
+        self.state_index = {_state: i for i, _state in enumerate(self.states)}
+        self.symbol_index = self.classes.index
+
+    def _live(self):
+        """
+        :return: {bytearray} 1 for each state number that can still reach an accept state
+        """
+        table = self.table
+        width = self.classes.count
+        predecessors = [[] for _ in range(self.dead + 1)]
+        for source in range(self.dead):
+            for target in table[source * width:(source + 1) * width]:
+                predecessors[target].append(source)
+
+        live = bytearray(self.dead + 1)
+        pending = [i for i in range(self.dead) if self.accepting[i]]
+        for _state in pending:
+            live[_state] = 1
+        while pending:
+            for source in predecessors[pending.pop()]:
+                if not live[source]:
+                    live[source] = 1
+                    pending.append(source)
+        return live
+
+    def __getstate__(self):  # the indexes are rebuilt, not pickled, and a mapped file is copied
+        return (self.states, self.classes, array('i', self.table), bytearray(self.accepting), self.initial,
+                bytearray(self.live))
+
+    def __setstate__(self, state):
+        self.states, self.classes, self.table, self.accepting, self.initial, self.live = state
+        self.dead = len(self.states)
+        self._index()
+
+    @classmethod
+    def from_dfa(cls, delta, initial_state, accept_states):
+        """Numbers states and symbol classes of a delta dict
+        :param delta: {dict} transitions in the {DFA} format, labels can be symbols,
+            {SymbolRange} or OTHER
+        :param initial_state: initial state
+        :param accept_states: {set} accept states
+        :return: {CompiledDFA}
+        """
+        # same rule as DFA.compute: frozenset states point straight to the next state,
+        # any other state points to a set holding it
+        single = not isinstance(initial_state, frozenset)
+
+        states = []
+        state_index = {}
+
+        def number(_state):
+            if _state not in state_index:
+                state_index[_state] = len(states)
+                states.append(_state)
+            return state_index[_state]
+
+        for current_state in delta:
+            number(current_state)
+
+        rows = []
+        for transitions in delta.values():
+            row = {}
+            for symbol, next_states in transitions.items():
+                if not next_states:  # a label without target still overrides OTHER
+                    row[symbol] = None
+                    continue
+                if single:
+                    next_states = next(iter(next_states))
+                row[symbol] = number(next_states)
+            rows.append(row)
+        initial = number(initial_state)
+
+        classes, signatures = SymbolClasses.build(rows)
+        dead = len(states)
+        width = classes.count
+        table = array('i', [dead]) * ((dead + 1) * width)
+        for column, targets in enumerate(signatures):
+            for source, target in enumerate(targets):
+                if target is not None:
+                    table[source * width + column] = target
+
+        accepting = bytearray(dead + 1)
+        for i, _state in enumerate(states):
+            if _state in accept_states:
+                accepting[i] = 1
+
+        return cls(states, classes, table, accepting, initial)
+
+    def to_bytes(self):
+        """Binary format, little-endian:
+        header, JSON with the symbol classes and state names, accept flags and
+        live flags per state (dead state included) and the int32 transition
+        table, each section aligned to 4 bytes.
+
+        :return: {bytes}
+        :raise ValueError: when a state or symbol can't be written, see _encode_name
+        """
+        frozen = isinstance(self.states[self.initial], frozenset)
+        states = [_encode_members(_state) if frozen else _encode_name(_state) for _state in self.states]
+        classes = self.classes.to_json()
+        classes['tokens'] = [[_encode_name(token), column] for token, column in classes['tokens']]
+        names = json.dumps({'classes': classes, 'states': states}).encode('utf-8')
+
+        flags = FROZENSET_STATES if frozen else 0
+        if any(isinstance(name, (list, dict)) for name in ([] if frozen else states)) or \
+                any(isinstance(token, (list, dict)) for token, _ in classes['tokens']):
+            flags |= ENCODED_NAMES
+
+        table = array('i', self.table)
+        if sys.byteorder == 'big':
+            table.byteswap()
+
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, flags,
+                             len(self.states), self.classes.count, self.initial, len(names))
+        accepting_offset = _align(HEADER.size + len(names))
+        live_offset = _align(accepting_offset + len(self.accepting))
+        table_offset = _align(live_offset + len(self.live))
+
+        data = bytearray(table_offset)
+        data[:HEADER.size] = header
+        data[HEADER.size:HEADER.size + len(names)] = names
+        data[accepting_offset:accepting_offset + len(self.accepting)] = self.accepting
+        data[live_offset:live_offset + len(self.live)] = self.live
+        return bytes(data) + table.tobytes()
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        """Reads the format written by to_bytes. On little-endian machines the
+        flags and the transition table are views over buffer, not copies, and
+        nothing is computed from the table.
+
+        :param buffer: {bytes}, {mmap} or any object supporting the buffer protocol
+        :return: {CompiledDFA}
+        :raise ValueError: when buffer is not in this format, or is truncated
+        """
+        view = memoryview(buffer).cast('B')
+        if len(view) < HEADER.size:
+            raise ValueError('not a compiled DFA file')
+        magic, version, flags, size, width, initial, names_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError('not a compiled DFA file')
+        if version != FORMAT_VERSION:
+            raise ValueError('unsupported compiled DFA format version %d' % version)
+
+        accepting_offset = _align(HEADER.size + names_size)
+        live_offset = _align(accepting_offset + size + 1)
+        table_offset = _align(live_offset + size + 1)
+        end = table_offset + 4 * (size + 1) * width
+        if len(view) < end:
+            raise ValueError('truncated compiled DFA file, %d bytes of %d' % (len(view), end))
+
+        names = json.loads(bytes(view[HEADER.size:HEADER.size + names_size]).decode('utf-8'))
+        if flags & FROZENSET_STATES:
+            states = [frozenset(_decode_name(member) for member in _state) for _state in names['states']]
+        elif flags & ENCODED_NAMES:
+            states = [_decode_name(_state) for _state in names['states']]
+        else:
+            states = names['states']
+        if len(states) != size or initial >= size:
+            raise ValueError('corrupt compiled DFA file')
+        classes = names['classes']
+        if flags & ENCODED_NAMES:
+            classes['tokens'] = [[_decode_name(token), column] for token, column in classes['tokens']]
+
+        accepting = view[accepting_offset:accepting_offset + size + 1]
+        live = view[live_offset:live_offset + size + 1]
+        table = view[table_offset:end]
+        if sys.byteorder == 'little' and array('i').itemsize == 4:
+            table = table.cast('i')
+        else:
+            table = _int32_array(table)
+
+        return cls(states, SymbolClasses.from_json(classes), table, accepting, initial, live)
+
+    def save(self, path):
+        """
+        :param path: file to write, see to_bytes for the format
+        """
+        with open(path, 'wb') as compiled_file:
+            compiled_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        :param path: file written by save
+        :param mmap: if True, the file is memory-mapped and matched in place,
+            so processes loading the same file share its pages
+        :return: {CompiledDFA}
+        """
+        with open(path, 'rb') as compiled_file:
+            if mmap:
+                return cls.from_buffer(memory_map(compiled_file.fileno(), 0, access=ACCESS_READ))
+            return cls.from_buffer(compiled_file.read())
+
+    def run(self, state, input_string):
+        """ compute strings over the table
+        :param state: {int} current state number
+        :param input_string: string to compute
+        :return: {int} last state number, the dead state as soon as
+            no accept state can be reached anymore
+        """
+        table = self.table
+        width = self.classes.count
+        symbol_index = self.symbol_index
+        classify = self.classes.classify
+        live = self.live
+        dead = self.dead
+
+        for a in input_string:
+            column = symbol_index.get(a)
+            if column is None:
+                column = classify(a)
+                if column is None:
+                    return dead
+            state = table[state * width + column]
+            if not live[state]:
+                return dead
+        return state
+
+    def accepts(self, input_string):
+        """
+        :param input_string: sentence to validate
+        :return: True, if is a valid sentence
+                 False, otherwise
+        """
+        return self.accepting[self.run(self.initial, input_string)] == 1
+
+    def is_accepting(self, state):
+        """
+        :param state: {int} state number
+        :return: True, if state is an accept state
+        """
+        return self.accepting[state] == 1
+
+    def is_dead(self, state):
+        """
+        :param state: {int} state number
+        :return: True, if no accept state can be reached from state
+        """
+        return not self.live[state]
+
+    def move(self, state, symbol):
+        """
+        :param state: {int} state number
+        :param symbol: input symbol
+        :return: {int} next state number, the dead state if the transition isn't defined
+        """
+        column = self.classes.classify(symbol)
+        if column is None:
+            return self.dead
+        return self.table[state * self.classes.count + column]
+
+    def reachable(self):
+        """
+        :return: {list} state numbers reachable from the initial state, in discovery order
+        """
+        table = self.table
+        width = self.classes.count
+        seen = {self.initial}
+        order = [self.initial]
+
+        for _state in order:
+            for target in table[_state * width:(_state + 1) * width]:
+                if target not in seen:
+                    seen.add(target)
+                    order.append(target)
+        return order
+
+    def useful(self):
+        """
+        :return: {list} state numbers both reachable and able to reach an accept state,
+            the initial state always included
+        """
+        return [_state for _state in self.reachable()
+                if _state == self.initial or (_state != self.dead and self.live[_state])]
+
+    def trim(self):
+        """
+        :return: {CompiledDFA} with only the useful states, in their order
+        """
+        useful = sorted(self.useful())
+        number = {_state: n for n, _state in enumerate(useful)}
+        width = self.classes.count
+        dead = len(useful)
+
+        table = array('i', [dead]) * ((dead + 1) * width)
+        accepting = bytearray(dead + 1)
+        for n, _state in enumerate(useful):
+            accepting[n] = self.accepting[_state]
+            for column in range(width):
+                target = number.get(self.table[_state * width + column])
+                if target is not None:
+                    table[n * width + column] = target
+
+        return CompiledDFA([self.states[_state] for _state in useful], self.classes, table, accepting,
+                           number[self.initial])
+
+    def minimize(self):
+        """Hopcroft's partition refinement over the reachable states.
+        States equivalent to the dead state are dropped, so their transitions
+        become undefined again; each block keeps the name of its first state.
+
+        :return: {CompiledDFA} minimal automaton for the same language
+        """
+        table = self.table
+        width = self.classes.count
+        dead = self.dead
+
+        reachable = set(self.reachable())
+        reachable.add(dead)  # the sink makes the automaton complete
+
+        inverse = [{} for _ in range(width)]
+        for source in reachable:
+            for column in range(width):
+                inverse[column].setdefault(table[source * width + column], []).append(source)
+
+        accepting = {_state for _state in reachable if self.accepting[_state]}
+        rejecting = reachable - accepting
+        blocks = [block for block in (accepting, rejecting) if block]
+        block_of = {}
+        for i, block in enumerate(blocks):
+            for _state in block:
+                block_of[_state] = i
+        waiting = {min(range(len(blocks)), key=lambda i: len(blocks[i]))}
+
+        while waiting:
+            splitter = list(blocks[waiting.pop()])
+            for column in range(width):
+                predecessors = inverse[column]
+                touched = {}
+                for target in splitter:
+                    for source in predecessors.get(target, ()):
+                        touched.setdefault(block_of[source], set()).add(source)
+
+                for i, inside in touched.items():
+                    block = blocks[i]
+                    if len(inside) == len(block):
+                        continue
+                    # the smaller half moves to the new block, so a state is
+                    # relabeled O(log n) times; block - inside is only computed
+                    # when it is smaller than inside, which was already walked
+                    if 2 * len(inside) <= len(block):
+                        block -= inside
+                        moved = inside
+                    else:
+                        moved = block - inside
+                        blocks[i] = inside
+                    blocks.append(moved)
+                    new = len(blocks) - 1
+                    for _state in moved:
+                        block_of[_state] = new
+                    waiting.add(new)  # the smaller half, or both halves if the block was waiting
+
+        dead_block = block_of[dead]
+        initial_block = block_of[self.initial]
+        kept = [i for i in range(len(blocks)) if i != dead_block or i == initial_block]
+        kept.sort(key=lambda i: min(blocks[i]))  # keep the delta order of the representatives
+        number = {i: n for n, i in enumerate(kept)}
+
+        new_dead = len(kept)
+        new_table = array('i', [new_dead]) * ((new_dead + 1) * width)
+        new_accepting = bytearray(new_dead + 1)
+        states = []
+        for n, i in enumerate(kept):
+            representative = min(blocks[i])
+            states.append(self.states[representative])
+            new_accepting[n] = self.accepting[representative]
+            for column in range(width):
+                target = block_of[table[representative * width + column]]
+                if target != dead_block:
+                    new_table[n * width + column] = number[target]
+
+        return CompiledDFA(states, self.classes, new_table, new_accepting, number[initial_block])
+
+    def to_delta(self):
+        """Rebuilds the transitions in the {DFA} format
+        :return: {tuple} (delta, initial_state, accept_states)
+        """
+        table = self.table
+        width = self.classes.count
+        dead = self.dead
+        single = not isinstance(self.states[self.initial], frozenset)
+
+        empty = set() if single else frozenset()
+
+        delta = {}
+        for i, _state in enumerate(self.states):
+            targets = []
+            for target in table[i * width:(i + 1) * width]:
+                if target == dead:
+                    targets.append(None)
+                else:
+                    targets.append({self.states[target]} if single else self.states[target])
+            delta[_state] = self.classes.transitions(targets, empty)
+
+        accept_states = [_state for i, _state in enumerate(self.states) if self.accepting[i]]
+        return delta, self.states[self.initial], accept_states
+
+
+class CompiledNDFA:
+    """Bitset simulation table of an NFA.
+
+    States are numbered in delta order and symbols the automaton cannot tell
+    apart share a column. A set of active states is an {int} whose bit i is
+    set when state number i is active, and for every column and state the
+    successors are precomputed as one mask. Epsilon transitions are folded
+    into those masks: every mask the table hands out is already epsilon-closed.
+
+    States are also grouped 8 at a time, one byte of the mask, and each group
+    has, per column, a row holding the OR of the successors of every
+    combination of its active states. A step visits only the groups with an
+    active state and costs one lookup and one OR per group, instead of one
+    per active state. A row is allocated the first time its group is active
+    on its column, and each combination is OR-ed once, the first time it is
+    active.
+    """
+
+    def __init__(self, states, classes, successors, accept_mask, initial, closure):
+        """CompiledNDFA Constructor
+        :param states: {list} state names, indexed by bit number
+        :param classes: {SymbolClasses} input symbol classes, indexed by column number
+        :param successors: {list} per column, {list} of successor masks per state
+        :param accept_mask: {int} mask of the accept states
+        :param initial: {int} mask of the initial states
+        :param closure: {list} epsilon closure mask per state
+        """
+        self.states = states
+        self.classes = classes
+        self.successors = successors
+        self.accept_mask = accept_mask
+        self.initial = initial
+        self.closure = closure
+        self.live_mask = self._live_mask()
+        self._index()
+
+    def _index(self):
+        self.state_index = {_state: i for i, _state in enumerate(self.states)}
+        self.symbol_index = self.classes.index
+        self.group_bytes = (len(self.states) + 7) // 8
+        self.groups = [[None] * self.group_bytes for _ in self.successors]  # per column, row per group
+
+    def _row(self, column, group):
+        """
+        :return: {list} successor masks of group on column indexed by its active bits,
+            None where not computed yet
+        """
+        row = self.groups[column][group] = [None] * 256
+        row[0] = 0
+        for i, mask in enumerate(self.successors[column][group * 8:group * 8 + 8]):
+            row[1 << i] = mask
+        return row
+
+    def _bits(self, mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _live_mask(self):
+        """
+        :return: {int} mask of the states that can still reach an accept state,
+            through symbols or '&'
+        """
+        predecessors = [[] for _ in self.states]
+        for source in range(len(self.states)):
+            targets = self.closure[source]
+            for successors in self.successors:
+                targets |= successors[source]
+            for target in self._bits(targets):
+                predecessors[target].append(source)
+
+        live = self.accept_mask
+        pending = list(self._bits(live))
+        while pending:
+            for source in predecessors[pending.pop()]:
+                if not (live >> source) & 1:
+                    live |= 1 << source
+                    pending.append(source)
+        return live
+
+    def useful(self):
+        """
+        :return: {int} mask of the states both reachable and able to reach an accept state,
+            the initial states always included
+        """
+        reachable = self.initial
+        pending = list(self._bits(reachable))
+        while pending:
+            source = pending.pop()
+            targets = self.closure[source]
+            for successors in self.successors:
+                targets |= successors[source]
+            for target in self._bits(targets & ~reachable):
+                reachable |= 1 << target
+                pending.append(target)
+        return (reachable & self.live_mask) | self.initial
+
+    def __getstate__(self):  # the indexes and group rows are rebuilt, not pickled
+        return (self.states, self.classes, self.successors, self.accept_mask, self.initial, self.closure,
+                self.live_mask)
+
+    def __setstate__(self, state):
+        (self.states, self.classes, self.successors, self.accept_mask, self.initial, self.closure,
+         self.live_mask) = state
+        self._index()
+
+    @classmethod
+    def from_ndfa(cls, delta, initial_state, accept_states):
+        """Numbers states and symbol classes of a delta dict
+        :param delta: {dict} transitions in the {NDFA} format, labels can be symbols,
+            {SymbolRange}, OTHER or '&'
+        :param initial_state: initial state
+        :param accept_states: {set} accept states
+        :return: {CompiledNDFA}
+        """
+        states = []
+        state_index = {}
+
+        def number(_state):
+            if _state not in state_index:
+                state_index[_state] = len(states)
+                states.append(_state)
+            return state_index[_state]
+
+        for current_state in delta:
+            number(current_state)
+
+        edges = []
+        epsilon_edges = []
+        for current_state, transitions in delta.items():
+            source = number(current_state)
+            row = {}
+            for symbol, next_states in transitions.items():
+                targets = [number(next_state) for next_state in next_states]
+                if symbol == EPSILON:
+                    epsilon_edges.extend((source, target) for target in targets)
+                else:
+                    row[symbol] = targets
+            edges.append(row)
+        initial_index = number(initial_state)
+
+        accepting = [i for i, _state in enumerate(states) if _state in accept_states]
+        return cls.from_edges(states, edges, epsilon_edges, initial_index, accepting)
+
+    @classmethod
+    def from_edges(cls, states, edges, epsilon_edges, initial_index, accepting):
+        """Builds the table from numbered states
+        :param states: {list} state names, indexed by state number
+        :param edges: {list} per state, {dict} label -> {list} of target state numbers,
+            states past the end of it have no transitions
+        :param epsilon_edges: {list} of (source, target) state numbers
+        :param initial_index: {int} initial state number
+        :param accepting: iterable of accept state numbers
+        :return: {CompiledNDFA}
+        """
+        closure = epsilon_closures(len(states), epsilon_edges)
+        initial = closure[initial_index]
+
+        rows = []
+        for row in edges:
+            masks = {}
+            for symbol, targets in row.items():
+                mask = 0
+                for target in targets:
+                    mask |= closure[target]
+                masks[symbol] = mask
+            rows.append(masks)
+
+        classes, signatures = SymbolClasses.build(rows, union=True)
+        padding = [0] * (len(states) - len(rows))  # states only seen as targets
+        successors = [list(targets) + padding for targets in signatures]
+
+        accept_mask = 0
+        for i in accepting:
+            accept_mask |= 1 << i
+
+        return cls(states, classes, successors, accept_mask, initial, closure)
+
+    def step(self, mask, column):
+        """
+        :param mask: {int} active states
+        :param column: {int} symbol number
+        :return: {int} states reached from mask
+        """
+        rows = self.groups[column]
+        new_mask = 0
+        for _ in range(SPARSE_GROUPS):  # few active states: find their groups from the low bit
+            if not mask:
+                return new_mask
+            shift = ((mask & -mask).bit_length() - 1) & ~7
+            bits = (mask >> shift) & 0xFF
+            mask ^= bits << shift
+            row = rows[shift >> 3]
+            if row is None:
+                row = self._row(column, shift >> 3)
+            successors = row[bits]
+            new_mask |= _fill(row, bits) if successors is None else successors
+
+        if mask:  # many: each of the steps above is linear in the size of mask, walk its bytes
+            for group, bits in enumerate(mask.to_bytes(self.group_bytes, 'little')):
+                if bits:
+                    row = rows[group]
+                    if row is None:
+                        row = self._row(column, group)
+                    successors = row[bits]
+                    new_mask |= _fill(row, bits) if successors is None else successors
+        return new_mask
+
+    def run(self, mask, input_string):
+        """ compute strings over the table
+        :param mask: {int} active states
+        :param input_string: string to compute
+        :return: {int} active states after the last symbol, 0 as soon as
+            no active state can reach an accept state
+        """
+        symbol_index = self.symbol_index
+        classify = self.classes.classify
+        step = self.step
+        live_mask = self.live_mask
+
+        for a in input_string:
+            column = symbol_index.get(a)
+            if column is None:
+                column = classify(a)
+                if column is None:
+                    return 0
+            mask = step(mask, column)
+            if not mask & live_mask:
+                return 0
+        return mask
+
+    def accepts(self, input_string):
+        """
+        :param input_string: sentence to validate
+        :return: True, if is a valid sentence
+                 False, otherwise
+        """
+        return (self.run(self.initial, input_string) & self.accept_mask) != 0
+
+    def is_accepting(self, mask):
+        """
+        :param mask: {int} active states
+        :return: True, if an accept state is active
+        """
+        return (mask & self.accept_mask) != 0
+
+    def is_dead(self, mask):
+        """
+        :param mask: {int} active states
+        :return: True, if no active state can reach an accept state
+        """
+        return not mask & self.live_mask
+
+    def move(self, mask, symbol):
+        """
+        :param mask: {int} active states
+        :param symbol: input symbol
+        :return: {int} states reached from mask
+        """
+        column = self.classes.classify(symbol)
+        if column is None:
+            return 0
+        return self.step(mask, column)
+
+    def names(self, mask):
+        """
+        :param mask: {int} active states
+        :return: {set} names of the active states
+        """
+        states = self.states
+        _states = set()
+        while mask:
+            low = mask & -mask
+            _states.add(states[low.bit_length() - 1])
+            mask ^= low
+        return _states
+
+    def determinize(self, max_states=None, progress=None, stats=None):
+        """Subset construction over state masks. Each subset reached is interned
+        to the next integer id, which is also its row in the new table, so rows
+        are processed in discovery order.
+
+        :param max_states: {int} optional budget of subset states
+        :param progress: optional callable, called as progress(discovered, pending)
+            every PROGRESS_INTERVAL subset states processed
+        :param stats: {AutomatonStats} optional
+        :return: {tuple} ({CompiledDFA} with the ids as states, {list} mask per id)
+        :raise StateBudgetExceeded: when more than max_states subsets are found
+        """
+        width = self.classes.count
+        step = self.step
+        masks = [self.initial]
+        index = {self.initial: 0}
+        rows = array('i')
+
+        with phase(stats, 'determinization.subsets'):
+            current = 0
+            while current < len(masks):  # masks grows while it is walked
+                if stats is not None:
+                    stats.sample('determinization.queue_depth', len(masks) - current)
+                    stats.sample('determinization.subset_size', bin(masks[current]).count('1'))
+                    stats.increment('determinization.mask_steps', width)
+                if progress is not None and current % PROGRESS_INTERVAL == 0:
+                    progress(len(masks), len(masks) - current)
+
+                mask = masks[current]
+                for column in range(width):
+                    next_mask = step(mask, column)
+                    if not next_mask:
+                        rows.append(-1)
+                        continue
+                    target = index.get(next_mask)
+                    if target is None:
+                        target = len(masks)
+                        if max_states is not None and target >= max_states:
+                            raise StateBudgetExceeded(max_states)
+                        index[next_mask] = target
+                        masks.append(next_mask)
+                    rows.append(target)
+                current += 1
+
+        dead = len(masks)
+        table = array('i', (dead if target < 0 else target for target in rows))
+        table.extend([dead] * width)
+        accepting = bytearray(dead + 1)
+        for i, mask in enumerate(masks):
+            if mask & self.accept_mask:
+                accepting[i] = 1
+
+        if stats is not None:
+            stats.increment('determinization.subset_states', dead)
+            stats.increment('determinization.transitions', dead * width - rows.count(-1))
+        return CompiledDFA(list(range(dead)), self.classes, table, accepting, 0), masks
+
+
+class SubsetTable:
+    """Maps the integer states of a determinized automaton back to NDFA subsets.
+    The subsets are kept as masks and only turned into names when asked.
+    """
+
+    def __init__(self, compiled, masks):
+        """SubsetTable Constructor
+        :param compiled: {CompiledNDFA} that was determinized
+        :param masks: {list} mask per integer state
+        """
+        self.compiled = compiled
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.masks)
+
+    def __getitem__(self, state):
+        """
+        :param state: {int} state of the determinized automaton
+        :return: {frozenset} NDFA states in it
+        """
+        return frozenset(self.compiled.names(self.masks[state]))
+
+
+class StateBudgetExceeded(Exception):
+    """Raised when a subset construction finds more states than its budget."""
+
+    def __init__(self, max_states):
+        super().__init__('subset construction exceeded %d states' % max_states)
+        self.max_states = max_states
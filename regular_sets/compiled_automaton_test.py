@@ -0,0 +1,226 @@
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.compiled_automaton import CompiledDFA, CompiledNDFA, epsilon_closures
+from regular_sets.finite_automaton import DFA, NDFA
+
+
+class CompiledDFATests(unittest.TestCase):
+    def setUp(self):
+        self.dfa = fixtures_test.ends_with_b()
+
+    def test_table_has_dead_state_row(self):
+        compiled = self.dfa.compile()
+
+        self.assertIsInstance(compiled, CompiledDFA)
+        self.assertEqual(['q0', 'q1'], compiled.states)
+        self.assertEqual(2, compiled.dead)
+        self.assertEqual(3 * compiled.classes.count, len(compiled.table))
+        self.assertEqual(bytearray([0, 1, 0]), compiled.accepting)
+
+        dead_row = compiled.table[compiled.dead * 2:]
+        self.assertEqual([compiled.dead, compiled.dead], list(dead_row))
+
+    def test_compute_matches_dict_path(self):
+        self.assertEqual('q0', self.dfa.compute('q0', 'aa'))
+        self.assertEqual('q1', self.dfa.compute('q0', 'abb'))
+        self.assertEqual({'reject'}, self.dfa.compute('q0', 'aba'))  # undefined transition
+        self.assertEqual({'reject'}, self.dfa.compute('q0', 'abc'))  # unknown symbol
+        self.assertEqual('q9', self.dfa.compute('q9', ''))
+        self.assertEqual({'reject'}, self.dfa.compute('q9', 'a'))
+
+    def test_validate_sentence(self):
+        self.assertTrue(self.dfa.validate_sentence('aab'))
+        self.assertFalse(self.dfa.validate_sentence(''))
+        self.assertFalse(self.dfa.validate_sentence('aba'))
+
+    def test_frozenset_states_from_determinization(self):
+        ndfa = NDFA({'q0': {'a': {'q0', 'q1'}}, 'q1': {'b': {'q2'}}}, 'q0', ['q2'])
+        dfa = ndfa.determinization()
+
+        self.assertEqual(frozenset({'q2'}), dfa.compute(dfa.initial_state, 'aab'))
+        self.assertTrue(dfa.validate_sentence('aab'))
+        self.assertFalse(dfa.validate_sentence('abb'))
+
+
+class SerializationTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'automaton.rdfa')
+        self.sentences = ['', 'a', 'b', 'ab', 'aab', 'aba', 'abab', 'abc']
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_load(self):
+        dfa = fixtures_test.ends_with_b()
+        dfa.save(self.path)
+
+        for mmap in (True, False):
+            loaded = DFA.load(self.path, mmap=mmap)
+
+            self.assertEqual('q0', loaded.initial_state)
+            self.assertSetEqual({'q1'}, loaded.accept_states)
+            self.assertEqual([dfa.validate_sentence(s) for s in self.sentences],
+                             list(loaded.validate_many(self.sentences)))
+            self.assertEqual('q1', loaded.compute('q0', 'abb'))
+            self.assertDictEqual(dfa.delta, loaded.delta)
+
+    def test_mapped_table_is_not_copied(self):
+        DFA({'q0': {'a': {'q0'}}}, 'q0', ['q0']).save(self.path)
+
+        compiled = CompiledDFA.load(self.path)
+
+        self.assertIsInstance(compiled.table, memoryview)
+        self.assertTrue(compiled.accepts('aaa'))
+        self.assertTrue(pickle.loads(pickle.dumps(compiled)).accepts('aaa'))
+
+    def test_save_determinized_ndfa(self):
+        ndfa = NDFA({'q0': {'a': {'q0', 'q1'}}, 'q1': {'b': {'q2'}}}, 'q0', ['q2'])
+        ndfa.save(self.path)
+
+        loaded = DFA.load(self.path)
+
+        self.assertEqual(frozenset({'q0'}), loaded.initial_state)
+        self.assertEqual([ndfa.validate_sentence(s) for s in self.sentences],
+                         list(loaded.validate_many(self.sentences)))
+
+    def test_live_flags_are_read_not_recomputed(self):
+        DFA({'q0': {'a': {'q0'}, 'b': {'q1'}}, 'q1': {}}, 'q0', ['q0']).save(self.path)
+
+        compiled = CompiledDFA.load(self.path)
+        copy = pickle.loads(pickle.dumps(compiled))
+
+        self.assertIsInstance(compiled.live, memoryview)
+        self.assertEqual(b'\x01\x00\x00', bytes(compiled.live))
+        self.assertEqual(b'\x01\x00\x00', bytes(copy.live))
+        self.assertTrue(copy.is_dead(copy.move(0, 'b')))
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as other_file:
+            other_file.write(b'\0' * 64)
+
+        self.assertRaises(ValueError, DFA.load, self.path)
+
+    def test_tuple_and_frozenset_names(self):
+        dfa = DFA({('q', 0): {('a', 'b'): {('q', frozenset({1, 2}))}, 'c': {('q', 0)}},
+                   ('q', frozenset({1, 2})): {}}, ('q', 0), [('q', frozenset({1, 2}))])
+        dfa.save(self.path)
+
+        loaded = DFA.load(self.path)
+
+        self.assertEqual(('q', 0), loaded.initial_state)
+        self.assertDictEqual(dfa.delta, loaded.delta)
+        self.assertTrue(loaded.validate_sentence(['c', ('a', 'b')]))
+
+    def test_rejects_names_that_cannot_be_saved(self):
+        dfa = DFA({'q0': {'a': {object()}}}, 'q0', [])
+
+        self.assertRaises(ValueError, dfa.save, self.path)
+
+    def test_rejects_truncated_files(self):
+        data = fixtures_test.ends_with_b().compile().to_bytes()
+
+        for size in (0, 10, len(data) - 4):
+            self.assertRaises(ValueError, CompiledDFA.from_buffer, data[:size])
+
+
+class CompiledNDFATests(unittest.TestCase):
+    def setUp(self):
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+
+    def test_successor_masks(self):
+        compiled = self.ndfa.compile()
+
+        self.assertIsInstance(compiled, CompiledNDFA)
+        self.assertEqual(['q0', 'q1', 'q2', 'q3'], compiled.states)
+        self.assertEqual(0b0001, compiled.initial)
+        self.assertEqual(0b1010, compiled.accept_mask)
+
+        a = compiled.symbol_index['a']
+        self.assertEqual([0b0110, 0b0010, 0b0000, 0b0100], compiled.successors[a])
+        self.assertEqual(0b0110, compiled.step(0b0001, a))
+        self.assertEqual(0b0010, compiled.step(0b1010, a) & 0b0010)
+
+    def test_group_step_matches_single_states(self):
+        rng = random.Random(3)
+        delta = {'q%d' % i: {'a': {'q%d' % rng.randrange(100) for _ in range(2)}} for i in range(100)}
+        compiled = NDFA(delta, 'q0', ['q99']).compile()
+        a = compiled.symbol_index['a']
+
+        for n in range(200):
+            mask = rng.getrandbits(100)
+            for _ in range(n % 4):  # from dense masks to a few states in a few groups
+                mask &= rng.getrandbits(100)
+            expected = 0
+            for i in range(100):
+                if mask >> i & 1:
+                    expected |= compiled.successors[a][i]
+            self.assertEqual(expected, compiled.step(mask, a))
+
+    def test_compute_matches_set_path(self):
+        self.assertSetEqual({'q1', 'q2'}, self.ndfa.compute('q0', 'a'))
+        self.assertSetEqual({'q3'}, self.ndfa.compute('q0', 'ab'))
+        self.assertSetEqual(set(), self.ndfa.compute('q0', 'abb'))
+        self.assertSetEqual(set(), self.ndfa.compute('q0', 'ac'))
+        self.assertSetEqual({'q9'}, self.ndfa.compute('q9', ''))
+        self.assertSetEqual(set(), self.ndfa.compute('q9', 'a'))
+
+    def test_validate_sentence(self):
+        self.assertTrue(self.ndfa.validate_sentence('aaa'))
+        self.assertTrue(self.ndfa.validate_sentence('abab'))
+        self.assertFalse(self.ndfa.validate_sentence('aab'))
+        self.assertFalse(self.ndfa.validate_sentence(''))
+
+
+class EpsilonClosureTests(unittest.TestCase):
+    def test_closures_through_components(self):
+        """epsilon graph: 0 -> 1 <-> 2 -> 3, 4 alone"""
+        closure = epsilon_closures(5, [(0, 1), (1, 2), (2, 1), (2, 3)])
+
+        self.assertEqual([0b01111, 0b01110, 0b01110, 0b01000, 0b10000], closure)
+
+    def test_epsilon_ndfa_compute(self):
+        """ delta table
+            L = { #a=pair xor #b=par }
+            delta |    a   |   b   |   &   |
+            ------|--------|-------|-------|
+             ->q0 |    -   |   -   | q1,q3 |
+              *q1 |   q2   |   -   |   -   |
+               q2 |   q1   |   -   |   -   |
+              *q3 |    -   |   q4  |   -   |
+               q4 |    -   |   q3  |   -   |
+            -------------------------------|
+        """
+        ndfa = NDFA({'q0': {'&': {'q1', 'q3'}},
+                     'q1': {'a': {'q2'}},
+                     'q2': {'a': {'q1'}},
+                     'q3': {'b': {'q4'}},
+                     'q4': {'b': {'q3'}}}, 'q0', ['q1', 'q3'])
+
+        self.assertSetEqual({'q0', 'q1', 'q3'}, ndfa.compute('q0', ''))
+        self.assertSetEqual({'q2'}, ndfa.compute('q0', 'a'))
+        self.assertTrue(ndfa.validate_sentence(''))
+        self.assertTrue(ndfa.validate_sentence('aa'))
+        self.assertTrue(ndfa.validate_sentence('bbbb'))
+        self.assertFalse(ndfa.validate_sentence('aaa'))
+        self.assertFalse(ndfa.validate_sentence('ab'))
+
+    def test_epsilon_cycle(self):
+        ndfa = NDFA({'q0': {'&': {'q1'}, 'a': {'q0'}},
+                     'q1': {'&': {'q0'}, 'b': {'q2'}},
+                     'q2': {'&': {'q1'}}}, 'q0', ['q2'])
+
+        self.assertSetEqual({'q0', 'q1'}, ndfa.epsilon_closure('q0'))
+        self.assertSetEqual({'q0', 'q1', 'q2'}, ndfa.epsilon_closure('q2'))
+        self.assertTrue(ndfa.validate_sentence('abab'))
+        self.assertFalse(ndfa.validate_sentence('aba'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+from collections import deque
+
+from regular_sets.alphabet import SymbolClasses, sentence
+from regular_sets.compiled_automaton import CompiledDFA, CompiledNDFA
+
+
+class CheckResult:
+    """Outcome of a language check, true when the check holds.
+    counterexample is a shortest sentence found that breaks it, None when it holds,
+    see alphabet.sentence for its type.
+    """
+
+    def __init__(self, holds, counterexample=None):
+        self.holds = holds
+        self.counterexample = counterexample
+
+    def __bool__(self):
+        return self.holds
+
+    def __repr__(self):
+        return 'CheckResult(%r, %r)' % (self.holds, self.counterexample)
+
+
+def _alphabet(a, b):
+    """
+    :param a: {CompiledDFA} or {CompiledNDFA}
+    :param b: {CompiledDFA} or {CompiledNDFA}
+    :return: {list} one symbol of each class neither automaton can split
+    """
+    classes, _ = SymbolClasses.product([a.classes, b.classes])
+    return [symbol for symbol in classes.representatives if symbol is not None]
+
+
+def _as_ndfa(compiled):
+    """
+    :param compiled: {CompiledDFA} or {CompiledNDFA}
+    :return: {CompiledNDFA} with a singleton mask for each DFA state
+    """
+    if isinstance(compiled, CompiledNDFA):
+        return compiled
+
+    width = compiled.classes.count
+    size = len(compiled.states)
+    successors = [[0] * size for _ in range(width)]
+    for source in range(size):
+        for column in range(width):
+            target = compiled.table[source * width + column]
+            if target != compiled.dead:
+                successors[column][source] = 1 << target
+    accept_mask = 0
+    for i in range(size):
+        if compiled.accepting[i]:
+            accept_mask |= 1 << i
+    closure = [1 << i for i in range(size)]
+    return CompiledNDFA(list(compiled.states), compiled.classes, successors, accept_mask,
+                        1 << compiled.initial, closure)
+
+
+def _word(path):
+    word = []
+    while path is not None:
+        path, symbol = path
+        word.append(symbol)
+    word.reverse()
+    return sentence(word)
+
+
+def _hopcroft_karp(a, b, sigma):
+    """Union-find over pairs of DFA states, merged as they are proven equivalent."""
+    parent = {}
+
+    def find(node):
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while node != root:  # path compression
+            parent[node], node = root, parent.get(node, node)
+        return root
+
+    queue = deque([(a.initial, b.initial, None)])
+    while queue:
+        p, q, path = queue.popleft()
+        left, right = find((0, p)), find((1, q))
+        if left == right:
+            continue
+        if a.is_accepting(p) != b.is_accepting(q):
+            return CheckResult(False, _word(path))
+        parent[left] = right
+        for symbol in sigma:
+            queue.append((a.move(p, symbol), b.move(q, symbol), (path, symbol)))
+    return CheckResult(True)
+
+
+def _hkc(a, b, sigma):
+    """Bisimulation up to congruence (Bonchi and Pous) over the subsets of both NDFAs.
+    b's states are shifted above a's, so a pair of subsets is one mask for each side
+    of the disjoint union, and a pair is skipped when the congruence closure of the
+    pairs already visited relates it.
+    """
+    shift = len(a.states)
+    relation = []
+
+    def normal_form(mask):
+        changed = True
+        while changed:
+            changed = False
+            for left, right in relation:
+                if left & ~mask == 0 and right & ~mask:
+                    mask |= right
+                    changed = True
+                elif right & ~mask == 0 and left & ~mask:
+                    mask |= left
+                    changed = True
+        return mask
+
+    queue = deque([(a.initial, b.initial, None)])
+    while queue:
+        x, y, path = queue.popleft()
+        left, right = x, y << shift
+        if normal_form(left) == normal_form(right):
+            continue
+        if a.is_accepting(x) != b.is_accepting(y):
+            return CheckResult(False, _word(path))
+        relation.append((left, right))
+        for symbol in sigma:
+            queue.append((a.move(x, symbol), b.move(y, symbol), (path, symbol)))
+    return CheckResult(True)
+
+
+def _antichain(larger, smaller, sigma):
+    """Searches a sentence of smaller outside larger over pairs (state of smaller,
+    subset of larger). A pair is pruned when a pair with the same state of smaller
+    and a subset of its subset was already visited, since that one rejects more."""
+    visited = {}
+    queue = deque([(smaller.initial, larger.initial, None)])
+
+    while queue:
+        p, subset, path = queue.popleft()
+        seen = visited.setdefault(p, [])
+        if any(other & ~subset == 0 for other in seen):
+            continue
+        if smaller.is_accepting(p) and not larger.is_accepting(subset):
+            return CheckResult(False, _word(path))
+        seen[:] = [other for other in seen if subset & ~other] + [subset]  # keep only minimal subsets
+        for symbol in sigma:
+            next_state = smaller.move(p, symbol)
+            if not smaller.is_dead(next_state):
+                queue.append((next_state, larger.move(subset, symbol), (path, symbol)))
+    return CheckResult(True)
+
+
+def equivalent(a, b):
+    """Checks L(a) = L(b) without determinizing either automaton up front.
+    Two DFAs are compared with Hopcroft and Karp's union-find, anything
+    else with bisimulation up to congruence over subsets.
+
+    :param a: {DFA} or {NDFA}
+    :param b: {DFA} or {NDFA}
+    :return: {CheckResult} with a sentence accepted by only one of them when they differ
+    """
+    left, right = a._engine(), b._engine()
+    sigma = _alphabet(left, right)
+
+    if isinstance(left, CompiledDFA) and isinstance(right, CompiledDFA):
+        return _hopcroft_karp(left, right, sigma)
+    return _hkc(_as_ndfa(left), _as_ndfa(right), sigma)
+
+
+def includes(a, b):
+    """Checks L(b) ⊆ L(a) with antichains, stopping at the first sentence of b outside a.
+    :param a: {DFA} or {NDFA}
+    :param b: {DFA} or {NDFA}
+    :return: {CheckResult} with a sentence accepted by b and rejected by a when it fails
+    """
+    larger, smaller = _as_ndfa(a._engine()), b._engine()
+    return _antichain(larger, smaller, _alphabet(larger, smaller))
@@ -0,0 +1,91 @@
+import itertools
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.equivalence import equivalent, includes
+from regular_sets.finite_automaton import DFA, NDFA
+
+
+class EquivalenceTests(unittest.TestCase):
+    def setUp(self):
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+        self.even = fixtures_test.even_length()
+        # same language, with redundant states
+        self.even_redundant = DFA({'p0': {'a': {'p1'}, 'b': {'p3'}},
+                                   'p1': {'a': {'p2'}, 'b': {'p0'}},
+                                   'p2': {'a': {'p3'}, 'b': {'p1'}},
+                                   'p3': {'a': {'p0'}, 'b': {'p2'}}}, 'p0', ['p0', 'p2'])
+
+    def test_equivalent_dfas(self):
+        result = equivalent(self.even, self.even_redundant)
+
+        self.assertTrue(result)
+        self.assertIsNone(result.counterexample)
+
+    def test_different_dfas(self):
+        odd = DFA(self.even.delta, 'q0', ['q1'])
+
+        result = equivalent(self.even, odd)
+
+        self.assertFalse(result)
+        self.assertEqual('', result.counterexample)
+
+    def test_ndfa_and_its_determinization(self):
+        self.assertTrue(equivalent(self.ndfa, self.ndfa.determinization()))
+        self.assertTrue(equivalent(self.ndfa.minimize(), self.ndfa))
+
+    def test_ndfa_counterexample(self):
+        result = equivalent(self.ndfa, self.even)
+
+        self.assertFalse(result)
+        self.assertIn(result.counterexample, ['', 'a', 'b'])
+        self.assertNotEqual(self.ndfa.validate_sentence(result.counterexample),
+                            self.even.validate_sentence(result.counterexample))
+
+    def test_epsilon_ndfa(self):
+        epsilon_ndfa = NDFA({'q0': {'&': {'q1', 'q3'}},
+                             'q1': {'a': {'q2'}},
+                             'q2': {'a': {'q1'}},
+                             'q3': {'b': {'q4'}},
+                             'q4': {'b': {'q3'}}}, 'q0', ['q1', 'q3'])
+
+        self.assertTrue(equivalent(epsilon_ndfa, epsilon_ndfa.determinization()))
+
+    def test_includes(self):
+        a_plus = DFA({'q0': {'a': {'q1'}}, 'q1': {'a': {'q1'}}}, 'q0', ['q1'])
+
+        self.assertTrue(includes(self.ndfa, a_plus))
+        self.assertTrue(includes(self.ndfa, self.ndfa))
+
+        result = includes(a_plus, self.ndfa)
+        self.assertFalse(result)
+        self.assertEqual('ab', result.counterexample)
+
+        result = includes(self.even, self.ndfa)
+        self.assertEqual('a', result.counterexample)
+
+    def test_token_and_int_counterexamples(self):
+        get = DFA({'q0': {'GET': {'q1'}, 'PUT': {'q1'}}, 'q1': {}}, 'q0', ['q1'])
+        get_only = DFA({'q0': {'GET': {'q1'}}, 'q1': {}}, 'q0', ['q1'])
+        one = DFA({0: {1: {1}}, 1: {}}, 0, [1])
+
+        result = equivalent(get, get_only)
+        self.assertEqual(('PUT',), result.counterexample)
+        self.assertTrue(get.validate_sentence(result.counterexample))
+        self.assertFalse(get_only.validate_sentence(result.counterexample))
+
+        self.assertEqual((1,), includes(DFA({0: {}}, 0, []), one).counterexample)
+
+    def test_agrees_with_sentences(self):
+        sentences = [''.join(w) for n in range(7) for w in itertools.product('ab', repeat=n)]
+        automata = [self.ndfa, self.even, self.even_redundant, self.ndfa.determinization()]
+
+        for a, b in itertools.product(automata, repeat=2):
+            same = all(a.validate_sentence(s) == b.validate_sentence(s) for s in sentences)
+            contained = all(a.validate_sentence(s) for s in sentences if b.validate_sentence(s))
+            self.assertEqual(same, bool(equivalent(a, b)))
+            self.assertEqual(contained, bool(includes(a, b)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,57 @@
-﻿from functools import reduce
+﻿from regular_sets.alphabet import OTHER
+from regular_sets.compiled_automaton import CompiledDFA, CompiledNDFA, StateBudgetExceeded, SubsetTable
+from regular_sets.lazy_automaton import LazyDFA
+from regular_sets.matcher import Matcher
 from regular_sets.regular_grammar import regular_grammar
+from regular_sets import scan
+from regular_sets.stats import phase
 
 
-def _union_sets(self, x, y):
-    if (len(x) or len(y)):
-        return (x | y)
+class _Consumed:
+    """Iterator over a sentence counting the symbols an engine actually reads,
+    which is fewer than the sentence when it stops once acceptance is impossible.
+    """
+
+    def __init__(self, input_string):
+        self.symbols = iter(input_string)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        symbol = next(self.symbols)
+        self.count += 1
+        return symbol
+
+
+def _compute_counted(compute, state, input_string, stats):
+    stats.increment('compute.calls')
+    symbols = _Consumed(input_string)
+    last_state = compute(state, symbols)
+    stats.increment('compute.symbols', symbols.count)
+    return last_state
+
+
+def _validate_counted(engine, input_string, stats):
+    stats.increment('validate_sentence.calls')
+    symbols = _Consumed(input_string)
+    accepted = engine.accepts(symbols)
+    stats.increment('validate_sentence.symbols', symbols.count)
+    if accepted:
+        stats.increment('validate_sentence.accepted')
+    return accepted
 
 
 class DFA:
-    """Class that encapsulates a DFA."""
+    """Class that encapsulates a DFA.
+
+    The compiled table and the indexes derived from the transitions are
+    built on first use and kept until delta, initial_state or accept_states
+    is assigned again or invalidate is called.
+    """
+
+    __slots__ = ('_delta', '_initial_state', '_accept_states', 'subsets', '_compiled', '_cache')
 
     def __init__(self, delta_transitions, initial_state, accept_states):
         """DFA Constructor
@@ -19,87 +62,276 @@ class DFA:
         """
         self.delta = delta_transitions
         self.initial_state = initial_state
-        self.accept_states = set(accept_states)
+        self.accept_states = accept_states
+        self.subsets = None
+
+    @property
+    def delta(self):
+        """{dict} transitions, rebuilt from the compiled table on first use after load"""
+        if self._delta is None:
+            self._delta = self._compiled.to_delta()[0]
+        return self._delta
+
+    @delta.setter
+    def delta(self, delta_transitions):
+        self._delta = delta_transitions
+        self._compiled = None
+        self._cache = {}
+
+    @property
+    def initial_state(self):
+        """initial state, assigning it drops the compiled table"""
+        return self._initial_state
+
+    @initial_state.setter
+    def initial_state(self, initial_state):
+        self._initial_state = initial_state
+        self.invalidate()
+
+    @property
+    def accept_states(self):
+        """{frozenset} accept states, assigning them drops the compiled table"""
+        return self._accept_states
+
+    @accept_states.setter
+    def accept_states(self, accept_states):
+        self._accept_states = frozenset(accept_states)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops the compiled table and the cached indexes.
+        Call it after changing delta in place.
+        """
+        if self._delta is None and self._compiled is not None:  # a loaded automaton only has its table
+            self._delta = self._compiled.to_delta()[0]
+        self._compiled = None
+        self._cache = {}
+
+    def _cached(self, name, build):
+        value = self._cache.get(name)
+        if value is None:
+            value = self._cache[name] = build()
+        return value
+
+    def save(self, path):
+        """Writes the compiled table in a versioned binary format
+        :param path: file to write
+        """
+        self._engine().save(path)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """Reads a file written by save. The transition table is matched in
+        place, and delta is only rebuilt if it is used.
+
+        :param path: file to read
+        :param mmap: if True, memory-map the file instead of reading it
+        :return: {DFA}
+        """
+        return DFA._from_compiled(CompiledDFA.load(path, mmap))
+
+    @staticmethod
+    def from_grammar(grammar, minimize=True):
+        """Compiles a grammar without building the NDFA delta on the way,
+        delta is only rebuilt if it is used.
 
-    def compute(self, state, input_string):
+        :param grammar: {regular_grammar}
+        :param minimize: if True, the table is minimized
+        :return: {DFA} with integer states
+        """
+        return DFA._from_compiled(grammar.compile(minimize))
+
+    @staticmethod
+    def _from_compiled(compiled):
+        accept_states = [_state for i, _state in enumerate(compiled.states) if compiled.accepting[i]]
+
+        dfa = DFA(None, compiled.states[compiled.initial], accept_states)
+        dfa._compiled = compiled
+        return dfa
+
+    def compile(self):
+        """Builds the integer-indexed transition table used by compute.
+        Call it again after changing delta in place.
+
+        :return: {CompiledDFA}
+        """
+        self._cache = {}
+        self._compiled = CompiledDFA.from_dfa(self.delta, self.initial_state, self.accept_states)
+        return self._compiled
+
+    def _engine(self):
+        if self._compiled is None:
+            self.compile()
+        return self._compiled
+
+    def compute(self, state, input_string, stats=None):
         """ compute strings in DFA
         :param state: is current state
         :param input_string: string to compute
+        :param stats: {AutomatonStats} optional, counts calls and input symbols read
         :return: last state computed
         """
-        _state = state
-
-        try:
-            if (not isinstance(_state, frozenset)):
-                for a in input_string:
-                    _state = next(iter(self.delta[_state][a]))
-            else:
-                for a in input_string:
-                    _state = self.delta[_state][a]
-        except KeyError:
+        if stats is not None:
+            return _compute_counted(self.compute, state, input_string, stats)
+        compiled = self._engine()
+        index = compiled.state_index.get(state)
+
+        if index is None:  # state without transitions only survives the empty string
+            for _ in input_string:
+                return {'reject'}
+            return state
+
+        index = compiled.run(index, input_string)
+        if index == compiled.dead:
             return {'reject'}
-        return _state
+        return compiled.states[index]
 
-    def validate_sentence(self, input_string):
+    def validate_sentence(self, input_string, stats=None):
         """
         :param input_string: sentence to validate
+        :param stats: {AutomatonStats} optional, counts calls, input symbols read and accepted sentences
         :return: True, if is a valid sentence
                  False, otherwise
         """
-        return self.compute(self.initial_state, input_string) in self.accept_states
+        if stats is not None:
+            return _validate_counted(self._engine(), input_string, stats)
+        return self._engine().accepts(input_string)
+
+    def validate_many(self, sentences):
+        """
+        :param sentences: iterable of sentences to validate
+        :return: generator of True or False, one per sentence, in order
+        """
+        accepts = self._engine().accepts
+        return (accepts(sentence) for sentence in sentences)
+
+    def matcher(self):
+        """Incremental validation of a sentence given in chunks,
+        ex. matcher.feed('ab').feed('ab').accepts()
+
+        :return: {Matcher} positioned on the initial state
+        """
+        return Matcher(self._engine())
+
+    def finditer(self, source, overlapping=False):
+        """Finds the substrings accepted by the automaton, in one forward pass over source.
+        Empty matches are not reported.
+
+        :param source: {str} text, or iterable of {str} chunks, ex. an open text file
+        :param overlapping: if False, leftmost-longest matches that do not overlap;
+            if True, the longest match starting at each position
+        :return: generator of (start, end) spans
+        """
+        return scan.finditer(self._engine(), source, overlapping)
+
+    def finditer_file(self, path, encoding='utf-8', overlapping=False):
+        """finditer over a memory-mapped file, decoded chunk by chunk
+        :param path: file to scan
+        :param encoding: {str} text encoding of the file
+        :param overlapping: see finditer
+        :return: generator of (start, end) spans, in characters
+        """
+        return scan.finditer(self._engine(), scan.read_chunks(path, encoding), overlapping)
+
+    def trim(self):
+        """Removes the states that are unreachable or cannot reach an accept state.
+        :return: {DFA} accepting the same language
+        """
+        return DFA(*self._engine().trim().to_delta())
+
+    def minimize(self):
+        """Hopcroft minimization. Unreachable states and states that cannot
+        reach an accept state are removed.
+
+        :return: {DFA} with the fewest states accepting the same language
+        """
+        return DFA(*self._engine().minimize().to_delta())
 
     def get_alphabet(self):
-        """Returns the NFA's or DFA's input alphabet, generated on the fly.
-        execute 'or (union)' between foreach two elements set from symbols of the machine
+        """Returns the NFA's or DFA's input alphabet, computed once.
 
-        :return: {set} alphabet
+        :return: {frozenset} alphabet
         """
-        sigma = reduce(
-            (lambda a_symbol, b_symbol: set(a_symbol) | set(b_symbol)),
-            [dicts.keys() for dicts in self.delta.values()])
+        def build():
+            sigma = set()
+            for transitions in self.delta.values():
+                sigma.update(transitions)
+            return frozenset(sigma)
 
-        return sigma
+        return self._cached('alphabet', build)
 
     def get_states(self):
-        """Returns the NFA's or DFA's input states, generated on the fly.
-        execute 'or union' between foreach two states set from machine
+        """Returns the NFA's or DFA's states, computed once.
 
-        :return: {set} states
+        :return: {frozenset} states
         """
-        states_list = reduce((lambda a_list, b_list: a_list + b_list),
-                             [list(symbols.values()) for symbols in self.delta.values()])
-
-        _states = {self.initial_state} | set(self.delta.keys()) | reduce((lambda a, b: a | b), states_list)
+        def build():
+            _states = {self.initial_state}
+            _states.update(self.delta)
+            for transitions in self.delta.values():
+                for next_states in transitions.values():
+                    _states.update(self._next_states(next_states))
+            return frozenset(_states)
+
+        return self._cached('states', build)
+
+    def _next_states(self, next_states):
+        # same rule as compute: frozenset states point straight to the next state
+        if isinstance(self.initial_state, frozenset):
+            return (next_states,) if next_states else ()
+        return next_states
+
+    def predecessors(self):
+        """Reverse-transition index, computed once.
+
+        :return: {dict} state -> {dict} symbol -> {set} states with a transition to it on symbol
+        """
+        def build():
+            reverse = {}
+            for current_state, transitions in self.delta.items():
+                for symbol, next_states in transitions.items():
+                    for next_state in self._next_states(next_states):
+                        reverse.setdefault(next_state, {}).setdefault(symbol, set()).add(current_state)
+            return reverse
 
-        return _states
+        return self._cached('predecessors', build)
 
     def to_grammar(self):
+        """Productions aB for each transition from A to B on a, plus a when B is an
+        accept state, and & for the initial state when it accepts. Frozenset states
+        are named by joining their sorted states.
+
+        :return: {regular_grammar}
+        :raise ValueError: when a transition is labeled by something other than one
+            character, such as a SymbolRange, OTHER or a token
         """
-        :return: Productions of grammar
-        """
-        terminals = self.get_alphabet()
-        initial_simbol = self.initial_state
+        if isinstance(self.initial_state, frozenset):
+            def name(_state):
+                return ''.join(sorted(str(member) for member in _state))
+        else:
+            name = str
+
         non_terminals = set()
         productions = dict()
-        temp = list()
-        string = ''
-        next_state = set()
-
-        for current_state in self.delta:  # each state
-            non_terminals.add(current_state)
-            for alphabet_simbol in self.delta[current_state]:  # each simbol of the alphabet
-                for next_state_simbol in self.delta[current_state][alphabet_simbol]:  # each next state
-                    string += next_state_simbol
-                    next_state.add(next_state_simbol)
-                    if next_state in self.accept_states and alphabet_simbol not in temp:
-                        temp.append(alphabet_simbol)
-                temp.append(alphabet_simbol + string)
-                string = ''
-            productions[current_state] = temp
-            temp = list()
-            next_state = set()
-
-        return regular_grammar(non_terminals, terminals, productions, initial_simbol)
+        for current_state, transitions in self.delta.items():
+            alternatives = set()
+            for symbol, next_states in transitions.items():
+                if not isinstance(symbol, str) or len(symbol) != 1:
+                    raise ValueError('%r from %r is not a character, a grammar has no terminal for it'
+                                     % (symbol, current_state))
+                for next_state in self._next_states(next_states):
+                    non_terminals.add(name(next_state))
+                    alternatives.add(symbol + name(next_state))
+                    if next_state in self.accept_states:
+                        alternatives.add(symbol)
+            productions[name(current_state)] = alternatives
+
+        initial_simbol = name(self.initial_state)
+        if self.initial_state in self.accept_states:
+            productions.setdefault(initial_simbol, set()).add('&')
+
+        non_terminals.update(productions)
+        return regular_grammar(non_terminals, set(self.get_alphabet()), productions, initial_simbol)
 
 
 class NDFA(DFA):
@@ -107,88 +339,133 @@ class NDFA(DFA):
     inherit from DFA
     """
 
-    def compute(self, state, input_string):
+    __slots__ = ()
+
+    def _next_states(self, next_states):
+        return next_states
+
+    def compile(self):
+        """override compile from {DFA}
+        Builds the bitset simulation table used by compute.
+        Call it again after changing delta in place.
+
+        :return: {CompiledNDFA}
+        """
+        self._cache = {}
+        self._compiled = CompiledNDFA.from_ndfa(self.delta, self.initial_state, self.accept_states)
+        return self._compiled
+
+    def compute(self, state, input_string, stats=None):
         """override compute from {DFA}
-        compute strings in NDFA
+        compute strings in NDFA, following '&' transitions
         :param state: is current state
         :param input_string: string to compute
+        :param stats: {AutomatonStats} optional, counts calls and input symbols read
         :return: empty set if transition isn't defined
                 else set with states
         """
-        _states = {state}
-        for a in input_string:
-            new_states = set([])
-            for _state in _states:
-                try:
-                    new_states |= self.delta[_state][a]
-                except KeyError:
-                    pass
-            _states = new_states
-        return _states
-
-    def validate_sentence(self, input_string):
+        if stats is not None:
+            return _compute_counted(self.compute, state, input_string, stats)
+        compiled = self._engine()
+        index = compiled.state_index.get(state)
+
+        if index is None:  # state without transitions only survives the empty string
+            for _ in input_string:
+                return set()
+            return {state}
+
+        return compiled.names(compiled.run(compiled.closure[index], input_string))
+
+    def validate_sentence(self, input_string, stats=None):
         """override validate_sentence from {DFA}
         :param input_string: sentence to validate
+        :param stats: {AutomatonStats} optional, counts calls, input symbols read and accepted sentences
         :return: True, if is a valid sentence
                  False, otherwise
         """
-        return len(self.compute(self.initial_state, input_string) & self.accept_states) > 0
+        if stats is not None:
+            return _validate_counted(self._engine(), input_string, stats)
+        return self._engine().accepts(input_string)
+
+    def save(self, path):
+        """override save from {DFA}
+        Writes the compiled table of the determinized automaton; load returns a {DFA}.
+
+        :param path: file to write
+        """
+        self.determinization().save(path)
+
+    def trim(self):
+        """override trim from {DFA}
+        Removes the states that are unreachable or cannot reach an accept state.
+
+        :return: {NDFA} accepting the same language
+        """
+        compiled = self._engine()
+        useful = compiled.names(compiled.useful())
+
+        delta = {}
+        for _state, transitions in self.delta.items():
+            if _state in useful:
+                # a label left without targets still keeps its symbols off OTHER
+                delta[_state] = {symbol: next_states & useful for symbol, next_states in transitions.items()
+                                 if next_states & useful or OTHER in transitions}
+        return NDFA(delta, self.initial_state, self.accept_states & useful)
+
+    def lazy_determinization(self, cache_size=1000, max_flushes=8):
+        """DFA whose subset states are built while sentences are validated,
+        without the full subset construction of determinization.
+
+        :param cache_size: {int} maximum number of cached subset states
+        :param max_flushes: {int} cache flushes allowed in one run before
+            the rest of the input is simulated on the NDFA
+        :return: {LazyDFA} compatible with this NDFA
+        """
+        return LazyDFA(self._engine(), cache_size, max_flushes)
+
+    def minimize(self):
+        """override minimize from {DFA}
+        :return: {DFA} minimal DFA compatible with this NDFA
+        """
+        return self.determinization().minimize()
 
-    def determinization(self):
+    def determinization(self, stats=None, max_states=None, progress=None, interned=False):
         """Converts the input NFA into a DFA.
+        :param stats: {AutomatonStats} optional, receives the subset states and transitions
+            created, the mask steps taken, the queue depth and subset size per iteration and
+            the time per phase; '&' closures are folded into the table in the compile phase
+        :param max_states: {int} optional budget of subset states
+        :param progress: optional callable, called as progress(discovered, pending) while subsets are found
+        :param interned: if True, the DFA states are integers and dfa.subsets maps them back to
+            frozensets of NDFA states; otherwise the states are those frozensets
         :return: {DFA} compatible with this NDFA
+        :raise StateBudgetExceeded: when more than max_states subset states are found
         """
-        closure = {_state: self.epsilon_closure(_state) for _state in self.get_states()}
-
-        _initial_state = frozenset(closure[self.initial_state])  # define _initial_state as immutable
-        _states = {_initial_state}
-        unprocessed_states = _states.copy()  # unprocessed_states tracks states for which delta is not yet defined
-        new_delta = {}
-        accept_states = []
-        sigma = self.get_alphabet()
-
-        while unprocessed_states:
-            current_state = unprocessed_states.pop()
-            new_delta[current_state] = {}
-            for symbol in sigma:
-                if symbol == '&':
-                    continue
-                next_states_list = [self.compute(q, symbol)
-                                    for q in current_state
-                                    if len(self.compute(q, symbol))]  # it gets list of next states
-                try:
-                    next_states = reduce(lambda x, y: _union_sets(closure[x], closure[y]),
-                                         next_states_list)  # union foreach list elements
-                except TypeError:
-                    next_states = set([])
-
-                next_states = frozenset(next_states)
-                if len(next_states):
-                    new_delta[current_state][symbol] = next_states
-
-                    if not next_states in _states:  # if new state found, add to unprocessed list for it processes in future
-                        _states.add(next_states)
-                        unprocessed_states.add(next_states)
-
-        for current_state in _states:
-            if len(current_state & self.accept_states) > 0:
-                accept_states.append(current_state)
-
-        return DFA(new_delta, _initial_state, accept_states)
+        with phase(stats, 'determinization.compile'):
+            compiled = self._engine()
+            if compiled.useful() != (1 << len(compiled.states)) - 1:
+                compiled = self.trim()._engine()
+        table, masks = compiled.determinize(max_states, progress, stats)
+
+        with phase(stats, 'determinization.accept_states'):
+            if not interned:
+                table = CompiledDFA([frozenset(compiled.names(mask)) for mask in masks],
+                                    table.classes, table.table, table.accepting, table.initial, table.live)
+            dfa = DFA(*table.to_delta())
+            dfa._compiled = table
+
+        if interned:
+            dfa.subsets = SubsetTable(compiled, masks)
+        return dfa
 
     def epsilon_closure(self, state):
-        epsilon_transitions = {_state: self.delta[_state]['&']
-                               for _state, symbol in self.delta.items()
-                               if '&' in symbol}
-        unprocessed_states = {state}
-        _epsilon_closure = {state}
-
-        while unprocessed_states:
-            current_state = unprocessed_states.pop()
-            if current_state in epsilon_transitions:
-                state_to_add = {_state for _state in epsilon_transitions[current_state]
-                                if _state not in _epsilon_closure}
-                _epsilon_closure |= state_to_add
-                unprocessed_states.add(s for s in state_to_add)
-
-        return _epsilon_closure
+        """
+        :param state: state to close
+        :return: {set} states reachable from state through '&' transitions
+        """
+        compiled = self._engine()
+        index = compiled.state_index.get(state)
+
+        if index is None:
+            return {state}
+        return compiled.names(compiled.closure[index])
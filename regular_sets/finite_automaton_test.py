@@ -1,6 +1,6 @@
 import unittest
 
-from regular_sets.finite_automaton import DFA, NDFA
+from regular_sets.finite_automaton import DFA, NDFA, StateBudgetExceeded
 
 
 class DFATests(unittest.TestCase):
@@ -50,6 +50,103 @@ class DFATests(unittest.TestCase):
         states = self.dfa.get_states()
         self.assertSetEqual({'q0', 'q1'}, states)
 
+    def test_derived_indexes_are_cached(self):
+        self.assertIs(self.dfa.get_alphabet(), self.dfa.get_alphabet())
+        self.assertIs(self.dfa.get_states(), self.dfa.get_states())
+        self.assertDictEqual({'q0': {'a': {'q1'}, 'b': {'q1'}}, 'q1': {'a': {'q0'}, 'b': {'q0'}}},
+                             self.dfa.predecessors())
+        self.assertFalse(hasattr(self.dfa, '__dict__'))
+
+    def test_invalidate_after_changing_delta(self):
+        self.assertTrue(self.dfa.validate_sentence('ab'))
+        self.dfa.delta['q1']['c'] = {'q0'}
+        self.assertFalse(self.dfa.validate_sentence('ac'))
+
+        self.dfa.invalidate()
+
+        self.assertTrue(self.dfa.validate_sentence('ac'))
+        self.assertSetEqual({'a', 'b', 'c'}, self.dfa.get_alphabet())
+
+    def test_assigning_initial_and_accept_states(self):
+        self.assertTrue(self.dfa.validate_sentence('ab'))
+
+        self.dfa.accept_states = ['q1']
+        self.assertFalse(self.dfa.validate_sentence('ab'))
+        self.assertTrue(self.dfa.validate_sentence('aba'))
+
+        self.dfa.initial_state = 'q1'
+        self.assertTrue(self.dfa.validate_sentence('ab'))
+        self.assertSetEqual({'q0', 'q1'}, self.dfa.get_states())
+
+        with self.assertRaises(AttributeError):
+            self.dfa.accept_states.add('q0')
+
+    def test_assigning_accept_states_of_a_compiled_only_dfa(self):
+        dfa = DFA._from_compiled(self.dfa.compile())
+
+        dfa.accept_states = ['q1']
+
+        self.assertTrue(dfa.validate_sentence('a'))
+        self.assertDictEqual(self.delta, dfa.delta)
+
+    def test_minimize(self):
+        """delta table
+           L = {w | w ∈ Σ*={a, b} and |w| is pair}
+
+           delta |   a   |   b   |
+           ------|-------|-------|
+           *->q0 |   q1  |  q3   |
+              q1 |   q2  |  q0   |
+             *q2 |   q3  |  q1   |
+              q3 |   q0  |  q2   |
+              q4 |   q5  |   -   |       q4 is unreachable
+              q5 |   q5  |   -   |       q5 cannot reach an accept state
+           ----------------------|
+        """
+        delta = {'q0': {'a': {'q1'}, 'b': {'q3'}},
+                 'q1': {'a': {'q2'}, 'b': {'q0'}},
+                 'q2': {'a': {'q3'}, 'b': {'q1'}},
+                 'q3': {'a': {'q0'}, 'b': {'q2'}},
+                 'q4': {'a': {'q5'}},
+                 'q5': {'a': {'q5'}}}
+        dfa = DFA(delta, 'q0', ['q0', 'q2'])
+
+        minimal = dfa.minimize()
+
+        self.assertIsInstance(minimal, DFA)
+        self.assertDictEqual(self.delta, minimal.delta)
+        self.assertEqual('q0', minimal.initial_state)
+        self.assertSetEqual({'q0'}, minimal.accept_states)
+
+    def test_minimize_drops_dead_states(self):
+        delta = {'q0': {'a': {'q1'}, 'b': {'q2'}},
+                 'q1': {'a': {'q1'}},
+                 'q2': {'b': {'q2'}}}
+        dfa = DFA(delta, 'q0', ['q0'])
+
+        minimal = dfa.minimize()
+
+        self.assertDictEqual({'q0': {}}, minimal.delta)
+        self.assertTrue(minimal.validate_sentence(''))
+        self.assertFalse(minimal.validate_sentence('a'))
+
+    def test_trim_and_early_rejection(self):
+        """q2 is unreachable and q3 cannot reach an accept state"""
+        delta = {'q0': {'a': {'q1'}, 'b': {'q3'}},
+                 'q1': {'a': {'q0'}},
+                 'q2': {'a': {'q0'}},
+                 'q3': {'a': {'q3'}, 'b': {'q3'}}}
+        dfa = DFA(delta, 'q0', ['q1'])
+
+        trimmed = dfa.trim()
+
+        self.assertDictEqual({'q0': {'a': {'q1'}}, 'q1': {'a': {'q0'}}}, trimmed.delta)
+        self.assertSetEqual({'q1'}, trimmed.accept_states)
+        self.assertEqual({'reject'}, dfa.compute('q0', 'b' + 'a' * 100))
+        self.assertEqual('q3', dfa.compute('q3', ''))
+        self.assertFalse(dfa.validate_sentence('baaa'))
+        self.assertTrue(dfa.validate_sentence('aaa'))
+
 
 class NDFATests(unittest.TestCase):
     def setUp(self):
@@ -228,6 +325,14 @@ class NDFATests(unittest.TestCase):
         # reject sentence 'aaabab'
         self.assertFalse(ndfa_determinized.validate_sentence('aaabab'))
 
+    def test_states_of_determinization(self):
+        dfa = self.ndfa.determinization()
+        states = dfa.get_states()
+
+        self.assertTrue(all(isinstance(_state, frozenset) for _state in states))
+        self.assertSetEqual(set(dfa.delta), set(states))
+        self.assertTrue(set(dfa.predecessors()) <= states)
+
     def test_determinization_epsilon_NDFA(self):
         """new delta table determinate
             transform this epsilon-NDFA to compatible DFA
@@ -266,6 +371,62 @@ class NDFATests(unittest.TestCase):
         # reject sentence 'aaa'
         self.assertFalse(epsilon_ndfa_determinized.validate_sentence('aaa'))
 
+    def test_determinization_interned(self):
+        dfa = self.ndfa.determinization(interned=True)
+
+        self.assertEqual(0, dfa.initial_state)
+        self.assertSetEqual(set(range(5)), set(dfa.delta))
+        self.assertEqual(5, len(dfa.subsets))
+
+        expected_dfa = self.expected_dfa()
+        named = {dfa.subsets[_state]: {symbol: dfa.subsets[next(iter(next_states))]
+                                       for symbol, next_states in transitions.items()}
+                 for _state, transitions in dfa.delta.items()}
+        self.assertDictEqual(expected_dfa.delta, named)
+        self.assertSetEqual(expected_dfa.accept_states, {dfa.subsets[_state] for _state in dfa.accept_states})
+
+        self.assertTrue(dfa.validate_sentence('ababab'))
+        self.assertFalse(dfa.validate_sentence('aaabab'))
+
+    def test_determinization_state_budget(self):
+        progress = []
+
+        self.assertRaises(StateBudgetExceeded, self.ndfa.determinization, max_states=4)
+        dfa = self.ndfa.determinization(max_states=5, progress=lambda *report: progress.append(report))
+
+        self.assertEqual(5, len(dfa.delta))
+        self.assertEqual([(1, 1)], progress)
+
+    def test_trim(self):
+        delta = dict(self.delta)
+        delta['q4'] = {'a': {'q0'}}  # unreachable
+        delta['q0'] = {'a': {'q1', 'q2'}, 'b': {'q5'}}
+        delta['q5'] = {'a': {'q5'}, '&': {'q6'}}  # cannot reach an accept state
+        ndfa = NDFA(delta, 'q0', ['q1', 'q3'])
+
+        trimmed = ndfa.trim()
+
+        self.assertIsInstance(trimmed, NDFA)
+        self.assertDictEqual(self.delta, trimmed.delta)
+        self.assertSetEqual(set(), ndfa.compute('q0', 'b' + 'a' * 100))
+        self.assertDictEqual(self.expected_dfa().delta, ndfa.determinization().delta)
+
+    def test_minimize(self):
+        minimal = self.ndfa.minimize()
+
+        self.assertIsInstance(minimal, DFA)
+        self.assertEqual(5, len(minimal.delta))
+        for sentence in ['a', 'aaa', 'ab', 'ababab', '', 'aab', 'aba', 'b']:
+            self.assertEqual(self.ndfa.validate_sentence(sentence), minimal.validate_sentence(sentence))
+
+    def test_minimize_epsilon_NDFA(self):
+        minimal = self.create_epsilon_ndfa().minimize()
+
+        self.assertEqual(5, len(minimal.delta))
+        self.assertTrue(minimal.validate_sentence(''))
+        self.assertTrue(minimal.validate_sentence('aa'))
+        self.assertFalse(minimal.validate_sentence('aaa'))
+
     def test_epsilon_closure_from_q0(self):
         epsilon_ndfa = self.create_epsilon_ndfa()
         _epsilon_closure = epsilon_ndfa.epsilon_closure('q0')
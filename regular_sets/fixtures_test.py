@@ -0,0 +1,53 @@
+"""Automata shared by the test modules, built fresh on each call so a test
+can change one without affecting the others."""
+from regular_sets.finite_automaton import DFA, NDFA
+
+
+def even_length():
+    """delta table
+       L = {w | w ∈ Σ*={a, b} and |w| is pair}
+
+       delta |   a   |   b   |
+       ------|-------|-------|
+       *->q0 |   q1  |  q1   |
+          q1 |   q0  |  q0   |
+       ----------------------|
+
+    :return: {DFA}
+    """
+    return DFA({'q0': {'a': {'q1'}, 'b': {'q1'}}, 'q1': {'a': {'q0'}, 'b': {'q0'}}}, 'q0', ['q0'])
+
+
+def ends_with_b():
+    """delta table
+       L = {w | w ∈ Σ*={a, b} and w ends with 'b'}
+
+       delta |   a   |   b   |
+       ------|-------|-------|
+        ->q0 |   q0  |  q1   |
+         *q1 |   -   |  q1   |
+       ----------------------|
+
+    :return: {DFA}
+    """
+    return DFA({'q0': {'a': {'q0'}, 'b': {'q1'}}, 'q1': {'b': {'q1'}}}, 'q0', ['q1'])
+
+
+def a_plus_or_ab_plus():
+    """delta table
+       L = { a+ or (ab)+ }
+
+       delta |    a   |   b   |
+       ------|--------|-------|
+        ->q0 | q1,q2  |   -   |
+         *q1 |   q1   |   -   |
+          q2 |   -    |  q3   |
+         *q3 |   q2   |   -   |
+       -----------------------|
+
+    :return: {NDFA}
+    """
+    return NDFA({'q0': {'a': {'q1', 'q2'}},
+                 'q1': {'a': {'q1'}},
+                 'q2': {'b': {'q3'}},
+                 'q3': {'a': {'q2'}}}, 'q0', ['q1', 'q3'])
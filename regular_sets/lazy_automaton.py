@@ -0,0 +1,140 @@
+UNKNOWN = -1
+DEAD = -2
+
+
+class LazyDFA:
+    """DFA built on demand from an NDFA while sentences are validated.
+
+    Subset states are the bitmasks of a {CompiledNDFA}, interned to numbers
+    the first time they are reached, and every transition is memoized once
+    computed. The cache holds at most cache_size subset states; when it is
+    full it is flushed, and an input that flushes it more than max_flushes
+    times is finished with plain NDFA stepping.
+    """
+
+    def __init__(self, compiled, cache_size=1000, max_flushes=8):
+        """LazyDFA Constructor
+        :param compiled: {CompiledNDFA} automaton to determinize
+        :param cache_size: {int} maximum number of cached subset states
+        :param max_flushes: {int} flushes allowed in one run before falling back to NDFA stepping
+        """
+        self.compiled = compiled
+        self.cache_size = max(cache_size, 1)
+        self.max_flushes = max_flushes
+        self.flushes = 0
+        self.fallbacks = 0
+        self.flush()
+
+    @property
+    def initial(self):
+        """{int} mask of the initial states"""
+        return self.compiled.initial
+
+    def is_accepting(self, mask):
+        """
+        :param mask: {int} active states
+        :return: True, if an accept state is active
+        """
+        return (mask & self.compiled.accept_mask) != 0
+
+    def is_dead(self, mask):
+        """
+        :param mask: {int} active states
+        :return: True, if no active state can reach an accept state
+        """
+        return not mask & self.compiled.live_mask
+
+    def flush(self):
+        """Drops every cached subset state and transition"""
+        self.masks = []
+        self.index = {}
+        self.transitions = []
+
+    def _intern(self, mask):
+        i = self.index.get(mask)
+        if i is None:
+            i = len(self.masks)
+            self.masks.append(mask)
+            self.index[mask] = i
+            self.transitions.append([UNKNOWN] * self.compiled.classes.count)
+        return i
+
+    def run(self, mask, input_string):
+        """ compute strings, building subset states as they are reached
+        :param mask: {int} active states
+        :param input_string: string to compute
+        :return: {int} active states after the last symbol, 0 as soon as
+            no active state can reach an accept state
+        """
+        compiled = self.compiled
+        symbol_index = compiled.symbol_index
+        classify = compiled.classes.classify
+        step = compiled.step
+        symbols = iter(input_string)
+        flushes = 0
+
+        if not mask:
+            return 0
+        if mask not in self.index and len(self.masks) >= self.cache_size:
+            self.flush()
+            self.flushes += 1
+        state = self._intern(mask)
+
+        for a in symbols:
+            column = symbol_index.get(a)
+            if column is None:
+                column = classify(a)
+                if column is None:
+                    return 0
+            row = self.transitions[state]
+            target = row[column]
+
+            if target == DEAD:
+                return 0
+            if target == UNKNOWN:
+                next_mask = step(self.masks[state], column)
+                if not next_mask & compiled.live_mask:
+                    row[column] = DEAD
+                    return 0
+                target = self.index.get(next_mask)
+                if target is None:
+                    if len(self.masks) >= self.cache_size:
+                        self.flush()
+                        self.flushes += 1
+                        flushes += 1
+                        if flushes > self.max_flushes:  # the cache thrashes on this input
+                            self.fallbacks += 1
+                            return compiled.run(next_mask, symbols)
+                        row = None  # the row belongs to the flushed cache
+                    target = self._intern(next_mask)
+                if row is not None:
+                    row[column] = target
+            state = target
+
+        return self.masks[state]
+
+    def compute(self, state, input_string):
+        """
+        :param state: is current state
+        :param input_string: string to compute
+        :return: empty set if transition isn't defined
+                else set with states
+        """
+        compiled = self.compiled
+        index = compiled.state_index.get(state)
+
+        if index is None:  # state without transitions only survives the empty string
+            for _ in input_string:
+                return set()
+            return {state}
+
+        return compiled.names(self.run(compiled.closure[index], input_string))
+
+    def validate_sentence(self, input_string):
+        """
+        :param input_string: sentence to validate
+        :return: True, if is a valid sentence
+                 False, otherwise
+        """
+        compiled = self.compiled
+        return (self.run(compiled.initial, input_string) & compiled.accept_mask) != 0
@@ -0,0 +1,58 @@
+import itertools
+import unittest
+
+from regular_sets.finite_automaton import NDFA
+from regular_sets.lazy_automaton import LazyDFA
+
+
+class LazyDFATests(unittest.TestCase):
+    def setUp(self):
+        """delta table
+           L = {w | w ∈ Σ*={a, b} and the third symbol from the end is 'a'}
+
+           delta |    a   |   b   |
+           ------|--------|-------|
+            ->q0 | q0,q1  |  q0   |
+              q1 |   q2   |  q2   |
+              q2 |   q3   |  q3   |
+             *q3 |   -    |   -   |
+           -----------------------|
+        """
+        self.delta = {
+            'q0': {'a': {'q0', 'q1'}, 'b': {'q0'}},
+            'q1': {'a': {'q2'}, 'b': {'q2'}},
+            'q2': {'a': {'q3'}, 'b': {'q3'}},
+            'q3': {}
+        }
+        self.ndfa = NDFA(self.delta, 'q0', ['q3'])
+        self.sentences = [''.join(w) for n in range(7) for w in itertools.product('ab', repeat=n)]
+
+    def test_validate_sentence(self):
+        lazy = self.ndfa.lazy_determinization()
+
+        self.assertIsInstance(lazy, LazyDFA)
+        for sentence in self.sentences:
+            self.assertEqual(self.ndfa.validate_sentence(sentence), lazy.validate_sentence(sentence))
+        self.assertLessEqual(len(lazy.masks), 8)  # every subset of {q1, q2, q3} plus q0
+        self.assertEqual(0, lazy.flushes)
+
+    def test_compute(self):
+        lazy = self.ndfa.lazy_determinization()
+
+        self.assertSetEqual({'q0', 'q1', 'q2'}, lazy.compute('q0', 'aa'))
+        self.assertSetEqual({'q3'}, lazy.compute('q1', 'ab'))
+        self.assertSetEqual(set(), lazy.compute('q3', 'a'))
+        self.assertSetEqual(set(), lazy.compute('q0', 'c'))
+
+    def test_bounded_cache_flushes_and_falls_back(self):
+        lazy = self.ndfa.lazy_determinization(cache_size=2, max_flushes=1)
+
+        for sentence in self.sentences:
+            self.assertEqual(self.ndfa.validate_sentence(sentence), lazy.validate_sentence(sentence))
+        self.assertLessEqual(len(lazy.masks), 2)
+        self.assertGreater(lazy.flushes, 0)
+        self.assertGreater(lazy.fallbacks, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
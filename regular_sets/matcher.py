@@ -0,0 +1,32 @@
+class Matcher:
+    """Validates one sentence fed in chunks.
+
+    Only the current state of the engine is kept between chunks, so the
+    sentence never has to be held in memory as a whole.
+    """
+
+    def __init__(self, engine):
+        """Matcher Constructor
+        :param engine: {CompiledDFA}, {CompiledNDFA} or {LazyDFA}
+        """
+        self.engine = engine
+        self.state = engine.initial
+
+    def feed(self, chunk):
+        """
+        :param chunk: next part of the sentence
+        :return: {Matcher} self, so calls can be chained
+        """
+        self.state = self.engine.run(self.state, chunk)
+        return self
+
+    def accepts(self):
+        """
+        :return: True, if the sentence fed so far is valid
+                 False, otherwise
+        """
+        return self.engine.is_accepting(self.state)
+
+    def reset(self):
+        """Starts a new sentence"""
+        self.state = self.engine.initial
@@ -0,0 +1,50 @@
+import io
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.matcher import Matcher
+
+
+class MatcherTests(unittest.TestCase):
+    def setUp(self):
+        self.dfa = fixtures_test.even_length()
+
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+
+    def test_validate_many(self):
+        sentences = ['', 'a', 'ab', 'aba', 'abab', 'abc']
+
+        self.assertEqual([True, False, True, False, True, False], list(self.dfa.validate_many(sentences)))
+        self.assertEqual([False, True, True, False, True, False], list(self.ndfa.validate_many(iter(sentences))))
+
+    def test_dfa_matcher_across_chunks(self):
+        matcher = self.dfa.matcher()
+
+        self.assertIsInstance(matcher, Matcher)
+        self.assertTrue(matcher.accepts())
+        self.assertFalse(matcher.feed('aba').accepts())
+        self.assertTrue(matcher.feed('b').feed('').feed('ab').accepts())
+        self.assertFalse(matcher.feed('c').feed('a').accepts())  # rejected for good
+
+        matcher.reset()
+        self.assertTrue(matcher.feed('ba').accepts())
+
+    def test_ndfa_matcher_reads_stream(self):
+        stream = io.StringIO('ab' * 1000)
+        matcher = self.ndfa.matcher()
+
+        for chunk in iter(lambda: stream.read(7), ''):
+            matcher.feed(chunk)
+        self.assertTrue(matcher.accepts())
+        self.assertFalse(matcher.feed('b').accepts())
+
+    def test_lazy_matcher(self):
+        matcher = Matcher(self.ndfa.lazy_determinization())
+
+        self.assertTrue(matcher.feed('aa').feed('a').accepts())
+        matcher.reset()
+        self.assertFalse(matcher.feed('aab').accepts())
+
+
+if __name__ == '__main__':
+    unittest.main()
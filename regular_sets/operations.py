@@ -0,0 +1,221 @@
+from collections import deque
+
+from regular_sets.alphabet import SymbolClasses, sentence
+from regular_sets.finite_automaton import DFA
+
+
+class ProductAutomaton:
+    """Product of automata, explored only from its initial state.
+
+    A product state is the tuple of the component states of the compiled
+    automata (state numbers of a DFA, state masks of an NDFA); accept and
+    doomed combine the per-component accept and dead flags. Symbols outside
+    the alphabet lead to None, a rejecting sink. The product steps over one
+    symbol of each class of the common refinement of the components' classes.
+    """
+
+    def __init__(self, automata, accept, doomed, alphabet):
+        """ProductAutomaton Constructor
+        :param automata: {list} of {DFA} or {NDFA}
+        :param accept: callable, gets the accept flags of the components, returns True if accepting
+        :param doomed: callable, gets the dead flags of the components, returns True if no word can be accepted anymore
+        :param alphabet: {set} labels of the input symbols of the product, None for every symbol
+        """
+        self.engines = tuple(automaton._engine() for automaton in automata)
+        self.accept = accept
+        self.doomed = doomed
+        self.initial = tuple(engine.initial for engine in self.engines)
+
+        parts = [engine.classes for engine in self.engines]
+        if alphabet is not None:
+            allowed, _ = SymbolClasses.build([{label: True for label in alphabet}])
+            parts.append(allowed)
+        self.classes, signatures = SymbolClasses.product(parts)
+        self.columns = set(column for column, signature in enumerate(signatures)
+                           if alphabet is None or signature[-1] is not None)
+        self.alphabet = [self.classes.representatives[column] for column in sorted(self.columns)
+                         if self.classes.representatives[column] is not None]
+
+    def move(self, state, symbol):
+        """
+        :param state: {tuple} product state
+        :param symbol: input symbol
+        :return: {tuple} next product state, None if the product rejects from here on
+        """
+        if state is None or self.classes.classify(symbol) not in self.columns:
+            return None
+        state = tuple(engine.move(component, symbol) for engine, component in zip(self.engines, state))
+        if self.is_dead(state):
+            return None
+        return state
+
+    def run(self, state, input_string):
+        """ compute strings in the product
+        :param state: {tuple} product state
+        :param input_string: string to compute
+        :return: {tuple} last product state, None if rejected
+        """
+        for a in input_string:
+            state = self.move(state, a)
+            if state is None:
+                return None
+        return state
+
+    def is_accepting(self, state):
+        """
+        :param state: {tuple} product state
+        :return: True, if state is an accept state
+        """
+        if state is None:
+            return False
+        return self.accept([engine.is_accepting(component) for engine, component in zip(self.engines, state)])
+
+    def is_dead(self, state):
+        """
+        :param state: {tuple} product state
+        :return: True, if no word is accepted from state
+        """
+        if state is None:
+            return True
+        return self.doomed([engine.is_dead(component) for engine, component in zip(self.engines, state)])
+
+    def validate_sentence(self, input_string):
+        """
+        :param input_string: sentence to validate
+        :return: True, if is a valid sentence
+                 False, otherwise
+        """
+        return self.is_accepting(self.run(self.initial, input_string))
+
+    def explore(self):
+        """Breadth-first walk over the reachable product states
+        :return: generator of (state, {dict} symbol -> next state), skipping moves to None
+        """
+        if self.is_dead(self.initial):
+            yield self.initial, {}
+            return
+        seen = {self.initial}
+        queue = deque([self.initial])
+
+        while queue:
+            state = queue.popleft()
+            transitions = {}
+            for symbol in self.alphabet:
+                next_state = self.move(state, symbol)
+                if next_state is None:
+                    continue
+                transitions[symbol] = next_state
+                if next_state not in seen:
+                    seen.add(next_state)
+                    queue.append(next_state)
+            yield state, transitions
+
+    def find_word(self):
+        """
+        :return: a shortest accepted sentence, see alphabet.sentence for its type,
+            None if the language is empty
+        """
+        parents = {self.initial: None}
+        queue = deque([self.initial])
+
+        while queue:
+            state = queue.popleft()
+            if self.is_accepting(state):
+                word = []
+                while parents[state] is not None:
+                    state, symbol = parents[state]
+                    word.append(symbol)
+                word.reverse()
+                return sentence(word)
+            for symbol in self.alphabet:
+                next_state = self.move(state, symbol)
+                if next_state is not None and next_state not in parents:
+                    parents[next_state] = (state, symbol)
+                    queue.append(next_state)
+        return None
+
+    def is_empty(self):
+        """
+        :return: True, if the product accepts no sentence
+        """
+        return self.find_word() is None
+
+    def to_dfa(self):
+        """Materializes the reachable part of the product
+        :return: {DFA} with states named 'q0', 'q1', ... in breadth-first order
+        """
+        names = {}
+
+        def name(state):
+            if state not in names:
+                names[state] = 'q%d' % len(names)
+            return names[state]
+
+        classify = self.classes.classify
+        delta = {}
+        accept_states = []
+        for state, transitions in self.explore():
+            targets = [None] * self.classes.count
+            for symbol, next_state in transitions.items():
+                targets[classify(symbol)] = {name(next_state)}
+            delta[name(state)] = self.classes.transitions(targets, set())
+            if self.is_accepting(state):
+                accept_states.append(name(state))
+
+        return DFA(delta, name(self.initial), accept_states)
+
+
+def _alphabet(automaton):
+    sigma = set(automaton.get_alphabet())
+    sigma.discard('&')
+    return sigma
+
+
+def _product(automata, accept, doomed, alphabet, lazy):
+    product = ProductAutomaton(automata, accept, doomed, alphabet)
+    if lazy:
+        return product
+    return product.to_dfa()
+
+
+def union(a, b, lazy=False):
+    """
+    :param a: {DFA} or {NDFA}
+    :param b: {DFA} or {NDFA}
+    :param lazy: if True, return the {ProductAutomaton} instead of building it
+    :return: {DFA} accepting L(a) ∪ L(b)
+    """
+    return _product([a, b], any, all, None, lazy)
+
+
+def intersection(a, b, lazy=False):
+    """
+    :param a: {DFA} or {NDFA}
+    :param b: {DFA} or {NDFA}
+    :param lazy: if True, return the {ProductAutomaton} instead of building it
+    :return: {DFA} accepting L(a) ∩ L(b)
+    """
+    return _product([a, b], all, any, None, lazy)
+
+
+def difference(a, b, lazy=False):
+    """
+    :param a: {DFA} or {NDFA}
+    :param b: {DFA} or {NDFA}
+    :param lazy: if True, return the {ProductAutomaton} instead of building it
+    :return: {DFA} accepting L(a) - L(b)
+    """
+    return _product([a, b], lambda flags: flags[0] and not flags[1], lambda flags: flags[0],
+                    None, lazy)
+
+
+def complement(a, alphabet=None, lazy=False):
+    """
+    :param a: {DFA} or {NDFA}
+    :param alphabet: {set} sentences are taken over it, default is the alphabet of a
+    :param lazy: if True, return the {ProductAutomaton} instead of building it
+    :return: {DFA} accepting alphabet* - L(a)
+    """
+    if alphabet is None:
+        alphabet = _alphabet(a)
+    return _product([a], lambda flags: not flags[0], lambda flags: False, set(alphabet), lazy)
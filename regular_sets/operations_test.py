@@ -0,0 +1,69 @@
+import itertools
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.finite_automaton import DFA
+from regular_sets.operations import ProductAutomaton, complement, difference, intersection, union
+
+
+class ProductTests(unittest.TestCase):
+    def setUp(self):
+        self.even = fixtures_test.even_length()
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+        self.sentences = [''.join(w) for n in range(7) for w in itertools.product('abc', repeat=n)]
+
+    def assertLanguage(self, automaton, expected):
+        for sentence in self.sentences:
+            self.assertEqual(expected(sentence), automaton.validate_sentence(sentence), sentence)
+
+    def test_union(self):
+        result = union(self.even, self.ndfa)
+
+        self.assertIsInstance(result, DFA)
+        self.assertLanguage(result, lambda w: self.even.validate_sentence(w) or self.ndfa.validate_sentence(w))
+
+    def test_intersection(self):
+        result = intersection(self.even, self.ndfa)
+
+        self.assertLanguage(result, lambda w: self.even.validate_sentence(w) and self.ndfa.validate_sentence(w))
+        self.assertEqual('aa', intersection(self.even, self.ndfa, lazy=True).find_word())
+
+    def test_difference(self):
+        result = difference(self.ndfa, self.even)
+
+        self.assertLanguage(result, lambda w: self.ndfa.validate_sentence(w) and not self.even.validate_sentence(w))
+
+    def test_complement(self):
+        result = complement(self.ndfa)
+
+        self.assertLanguage(result, lambda w: 'c' not in w and not self.ndfa.validate_sentence(w))
+        self.assertTrue(result.validate_sentence(''))
+        self.assertTrue(complement(self.ndfa, alphabet={'a', 'b', 'c'}).validate_sentence('c'))
+
+    def test_lazy_product_explores_only_reachable_states(self):
+        product = intersection(self.even, self.ndfa, lazy=True)
+
+        self.assertIsInstance(product, ProductAutomaton)
+        self.assertTrue(product.validate_sentence('abab'))
+        self.assertFalse(product.validate_sentence('aaa'))
+        self.assertEqual(len(product.to_dfa().delta), len(list(product.explore())))
+
+    def test_emptiness(self):
+        self.assertTrue(intersection(self.ndfa, complement(self.ndfa), lazy=True).is_empty())
+        self.assertTrue(difference(self.ndfa, self.ndfa, lazy=True).is_empty())
+        self.assertIsNone(difference(self.ndfa, union(self.even, self.ndfa), lazy=True).find_word())
+        self.assertEqual('a', difference(self.ndfa, self.even, lazy=True).find_word())
+
+    def test_find_word_with_token_and_int_labels(self):
+        get = DFA({'q0': {'GET': {'q1'}}, 'q1': {}}, 'q0', ['q1'])
+        one = DFA({0: {1: {1}}, 1: {}}, 0, [1])
+
+        word = intersection(get, get, lazy=True).find_word()
+
+        self.assertEqual(('GET',), word)
+        self.assertTrue(get.validate_sentence(word))
+        self.assertEqual((1,), intersection(one, one, lazy=True).find_word())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+from collections import deque
+from itertools import islice
+import multiprocessing
+
+CHUNKS_PER_WORKER = 2  # chunks in flight per worker process
+
+_engine = None  # compiled automaton of the worker process
+
+
+def _start_worker(engine):
+    global _engine
+    _engine = engine
+
+
+def _validate_chunk(sentences):
+    accepts = _engine.accepts
+    return [accepts(sentence) for sentence in sentences]
+
+
+def _chunks(sentences, chunksize):
+    sentences = iter(sentences)
+    chunk = list(islice(sentences, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(sentences, chunksize))
+
+
+def _validate_in_pool(engine, sentences, workers, chunksize):
+    workers = workers or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(workers, _start_worker, (engine,))
+    try:
+        # a chunk is only read from sentences when one in flight is done,
+        # so memory is bounded whatever the size of the input
+        pending = deque()
+        for chunk in _chunks(sentences, chunksize):
+            pending.append(pool.apply_async(_validate_chunk, (chunk,)))
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                for result in pending.popleft().get():
+                    yield result
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def parallel_validate(automaton, sentences, workers=None, chunksize=1000):
+    """Validates sentences in worker processes.
+    The compiled table of the automaton is sent once to each worker, then
+    the sentences travel in chunks and the results come back in order.
+    At most CHUNKS_PER_WORKER chunks per worker are read ahead of the
+    results, so sentences can be a stream of any length.
+
+    :param automaton: {DFA} or {NDFA}
+    :param sentences: iterable of sentences to validate
+    :param workers: {int} number of processes, default is the number of CPUs
+    :param chunksize: {int} sentences sent to a worker at a time
+    :return: generator of True or False, one per sentence, in order
+    """
+    if workers == 1:
+        return automaton.validate_many(sentences)
+    return _validate_in_pool(automaton._engine(), sentences, workers, max(chunksize, 1))
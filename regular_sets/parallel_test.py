@@ -0,0 +1,53 @@
+import itertools
+import pickle
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.parallel import CHUNKS_PER_WORKER, parallel_validate
+
+
+class ParallelValidateTests(unittest.TestCase):
+    def setUp(self):
+        self.dfa = fixtures_test.even_length()
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+        self.sentences = [''.join(w) for n in range(8) for w in itertools.product('ab', repeat=n)]
+
+    def test_dfa_results_in_order(self):
+        results = list(parallel_validate(self.dfa, self.sentences, workers=2, chunksize=16))
+
+        self.assertEqual([self.dfa.validate_sentence(s) for s in self.sentences], results)
+
+    def test_ndfa_results_in_order(self):
+        results = list(parallel_validate(self.ndfa, iter(self.sentences), workers=2, chunksize=7))
+
+        self.assertEqual([self.ndfa.validate_sentence(s) for s in self.sentences], results)
+
+    def test_reads_a_bounded_window_of_chunks(self):
+        read = []
+
+        def sentences():
+            for i in range(100000):
+                read.append(i)
+                yield 'ab'
+
+        results = parallel_validate(self.dfa, sentences(), workers=2, chunksize=10)
+
+        self.assertTrue(next(results))
+        self.assertLessEqual(len(read), (2 * CHUNKS_PER_WORKER + 1) * 10)
+        results.close()
+
+    def test_single_worker_runs_in_process(self):
+        results = list(parallel_validate(self.dfa, self.sentences, workers=1))
+
+        self.assertEqual([self.dfa.validate_sentence(s) for s in self.sentences], results)
+
+    def test_compiled_tables_pickle_without_indexes(self):
+        for automaton in (self.dfa, self.ndfa):
+            engine = pickle.loads(pickle.dumps(automaton.compile()))
+
+            self.assertEqual(automaton.compile().state_index, engine.state_index)
+            self.assertTrue(engine.accepts('abab'))
+
+
+if __name__ == '__main__':
+    unittest.main()
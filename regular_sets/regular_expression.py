@@ -0,0 +1,225 @@
+from collections import OrderedDict
+import threading
+
+from regular_sets.finite_automaton import NDFA
+
+METACHARACTERS = set('|*+?()\\')
+
+
+class _ThompsonParser:
+    """Recursive descent over the pattern, building Thompson fragments as it goes.
+    A fragment is a pair (start, accept) of states joined by '&' transitions.
+
+    grammar:
+        alternation -> concatenation ('|' concatenation)*
+        concatenation -> repetition*
+        repetition -> atom ('*' | '+' | '?')*
+        atom -> '(' alternation ')' | '\\' symbol | '&' | symbol
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.position = 0
+        self.delta = {}
+
+    def parse(self):
+        start, accept = self.alternation()
+        if self.position < len(self.pattern):
+            self.error('unexpected %r' % self.pattern[self.position])
+        return NDFA(self.delta, start, [accept])
+
+    def error(self, message):
+        raise ValueError('%s at position %d of %r' % (message, self.position, self.pattern))
+
+    def peek(self):
+        if self.position < len(self.pattern):
+            return self.pattern[self.position]
+        return None
+
+    def state(self):
+        name = 'q%d' % len(self.delta)
+        self.delta[name] = {}
+        return name
+
+    def edge(self, source, symbol, target):
+        self.delta[source].setdefault(symbol, set()).add(target)
+
+    def alternation(self):
+        fragments = [self.concatenation()]
+        while self.peek() == '|':
+            self.position += 1
+            fragments.append(self.concatenation())
+        if len(fragments) == 1:
+            return fragments[0]
+
+        start, accept = self.state(), self.state()
+        for fragment_start, fragment_accept in fragments:
+            self.edge(start, '&', fragment_start)
+            self.edge(fragment_accept, '&', accept)
+        return start, accept
+
+    def concatenation(self):
+        fragment = None
+        while self.peek() not in (None, '|', ')'):
+            next_fragment = self.repetition()
+            if fragment is None:
+                fragment = next_fragment
+            else:
+                self.edge(fragment[1], '&', next_fragment[0])
+                fragment = (fragment[0], next_fragment[1])
+        if fragment is None:  # empty sentence
+            start = self.state()
+            return start, start
+        return fragment
+
+    def repetition(self):
+        fragment_start, fragment_accept = self.atom()
+        while self.peek() in ('*', '+', '?'):
+            operator = self.pattern[self.position]
+            self.position += 1
+            start, accept = self.state(), self.state()
+            self.edge(start, '&', fragment_start)
+            self.edge(fragment_accept, '&', accept)
+            if operator in '*?':
+                self.edge(start, '&', accept)
+            if operator in '*+':
+                self.edge(fragment_accept, '&', fragment_start)
+            fragment_start, fragment_accept = start, accept
+        return fragment_start, fragment_accept
+
+    def atom(self):
+        symbol = self.peek()
+        if symbol is None:
+            self.error('missing expression')
+        self.position += 1
+
+        if symbol == '(':
+            fragment = self.alternation()
+            if self.peek() != ')':
+                self.error('missing )')
+            self.position += 1
+            return fragment
+        if symbol == '&':
+            start = self.state()
+            return start, start
+        if symbol == '\\':
+            symbol = self.peek()
+            if symbol is None:
+                self.error('nothing to escape')
+            if symbol == '&':  # every automaton reads the '&' label as an empty transition
+                self.error("'&' can't be escaped")
+            self.position += 1
+        elif symbol in METACHARACTERS:
+            self.position -= 1
+            self.error('unexpected %r' % symbol)
+
+        start, accept = self.state(), self.state()
+        self.edge(start, symbol, accept)
+        return start, accept
+
+
+class RegexCache:
+    """Least recently used cache of compiled patterns, with hit and miss counts."""
+
+    def __init__(self, maxsize=128):
+        """RegexCache Constructor
+        :param maxsize: {int} patterns kept
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, build):
+        """
+        :param key: hashable key of the entry
+        :param build: callable without arguments, builds the entry on a miss
+        :return: cached entry
+        """
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        value = build()
+        with self.lock:
+            self.entries[key] = value
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return value
+
+    def info(self):
+        """
+        :return: {dict} with hits, misses, size and maxsize
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'maxsize': self.maxsize}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = RegexCache()
+
+
+def parse(pattern):
+    """Thompson construction, without the cache.
+    Operators are '|', '*', '+', '?' and parentheses, '&' is the empty
+    sentence and '\\' makes the next character a symbol. '&' itself can't
+    be a symbol, since it labels the empty transitions of the automaton.
+
+    :param pattern: {str} regular expression
+    :return: {NDFA} with '&' transitions
+    :raise ValueError: when the pattern is malformed
+    """
+    return _ThompsonParser(pattern).parse()
+
+
+def to_ndfa(pattern):
+    """Cached parse. The automaton is shared by every caller, do not change it.
+    :param pattern: {str} regular expression
+    :return: {NDFA}
+    """
+    return _cache.get(('ndfa', pattern), lambda: parse(pattern))
+
+
+def to_dfa(pattern, minimize=True):
+    """Cached, compiled DFA of the pattern. The automaton is shared by every caller, do not change it.
+    :param pattern: {str} regular expression
+    :param minimize: if True, the DFA is minimized
+    :return: {DFA} with its transition table already compiled
+    """
+    def build():
+        dfa = parse(pattern).determinization()
+        if minimize:
+            dfa = dfa.minimize()
+        dfa.compile()
+        return dfa
+
+    return _cache.get(('dfa', pattern, minimize), build)
+
+
+def cache_info():
+    """
+    :return: {dict} with hits, misses, size and maxsize of the pattern cache
+    """
+    return _cache.info()
+
+
+def set_cache_size(maxsize):
+    """
+    :param maxsize: {int} patterns kept, the least recently used are dropped first
+    """
+    with _cache.lock:
+        _cache.maxsize = maxsize
+        while len(_cache.entries) > maxsize:
+            _cache.entries.popitem(last=False)
+
+
+def clear_cache():
+    _cache.clear()
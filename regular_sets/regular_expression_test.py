@@ -0,0 +1,74 @@
+import itertools
+import re
+import unittest
+
+from regular_sets import regular_expression
+from regular_sets.finite_automaton import DFA, NDFA
+
+
+class RegularExpressionTests(unittest.TestCase):
+    def setUp(self):
+        regular_expression.clear_cache()
+        self.sentences = [''.join(w) for n in range(6) for w in itertools.product('abc', repeat=n)]
+
+    def tearDown(self):
+        regular_expression.set_cache_size(128)
+        regular_expression.clear_cache()
+
+    def assertSameLanguage(self, pattern, automaton, python_pattern=None):
+        expected = re.compile(python_pattern or pattern)
+        for sentence in self.sentences:
+            self.assertEqual(expected.fullmatch(sentence) is not None, automaton.validate_sentence(sentence),
+                             '%r on %r' % (pattern, sentence))
+
+    def test_thompson_construction(self):
+        for pattern in ['a', 'ab|c', 'a*', '(ab)+', 'a?b', '(a|b)*c', 'a(b|c)*a?', '((a|&)b)*', 'a|']:
+            ndfa = regular_expression.parse(pattern)
+
+            self.assertIsInstance(ndfa, NDFA)
+            self.assertSameLanguage(pattern, ndfa, pattern.replace('&', ''))
+
+    def test_minimized_dfa(self):
+        dfa = regular_expression.to_dfa('(a|b)*abb')
+
+        self.assertIsInstance(dfa, DFA)
+        self.assertEqual(4, len(dfa.delta))
+        self.assertSameLanguage('(a|b)*abb', dfa)
+
+    def test_escape(self):
+        ndfa = regular_expression.parse('a\\*')
+
+        self.assertTrue(ndfa.validate_sentence('a*'))
+        self.assertFalse(ndfa.validate_sentence('aa'))
+
+    def test_malformed_patterns(self):
+        for pattern in ['(a', 'a)', '*a', 'a\\', '(', 'a\\&b']:
+            self.assertRaises(ValueError, regular_expression.parse, pattern)
+
+    def test_cache_statistics(self):
+        first = regular_expression.to_dfa('a(b|c)*')
+        second = regular_expression.to_dfa('a(b|c)*')
+        regular_expression.to_ndfa('a(b|c)*')
+
+        self.assertIs(first, second)
+        self.assertDictEqual({'hits': 1, 'misses': 2, 'size': 2, 'maxsize': 128}, regular_expression.cache_info())
+
+    def test_dfa_miss_takes_one_slot(self):
+        regular_expression.to_dfa('a(b|c)*')
+
+        self.assertDictEqual({'hits': 0, 'misses': 1, 'size': 1, 'maxsize': 128}, regular_expression.cache_info())
+
+    def test_least_recently_used_is_dropped(self):
+        regular_expression.set_cache_size(2)
+        first = regular_expression.to_ndfa('a')
+        regular_expression.to_ndfa('b')
+        regular_expression.to_ndfa('a')
+        regular_expression.to_ndfa('c')  # drops 'b'
+
+        self.assertIs(first, regular_expression.to_ndfa('a'))
+        regular_expression.to_ndfa('b')
+        self.assertEqual(4, regular_expression.cache_info()['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,35 +1,102 @@
 ﻿
-def make_it_proper_to_grammar(transitions_str):
-        """
-        :param transitions_str: {string} grammar
-        """
-        grammar = transitions_str.split(' ')
-        initial_simbol = grammar[0]
-        non_terminals = set()
-        terminals = set()
-        temporary_alfa = ''
-        temporary_beta = set()
+import io
+import re
+
+from regular_sets.compiled_automaton import CompiledNDFA
+
+ACCEPT = 'qAccept'
+EPSILON = '&'
+
+TOKEN = re.compile(r'->|\||(?:(?!->)[^\s|])+')
+
+
+def parse_grammar(source):
+    """Reads productions 'A -> aB | b | &' one token at a time, so the grammar
+    can be read line by line from a stream, with any whitespace and line breaks
+    between tokens. In an alternative the first character is the terminal and
+    the rest, of any length, is the non-terminal; '&' alone is the empty sentence.
+    The first non-terminal defined is the initial symbol.
+
+    :param source: {str} grammar, or iterable of lines, ex. an open file
+    :return: {regular_grammar}
+    :raise ValueError: on a malformed grammar, with the line number
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    non_terminals = set()
+    terminals = set()
+    productions = {}
+    initial_simbol = None
+    alternatives = None  # set of the production being read
+    pending = None  # last symbol read, an alternative unless '->' follows it
+    separated = False  # pending came right after '->' or '|'
+    after_separator = False
+    line_number = 0
+
+    def error(message):
+        raise ValueError('%s at line %d' % (message, line_number))
+
+    def add(alternative):
+        if alternatives is None:
+            error("%r before the first '->'" % alternative)
+        if not separated:
+            error("missing '|' before %r" % alternative)
+        alternatives.add(alternative)
+        terminals.add(alternative[0])
+        if len(alternative) > 1:
+            non_terminals.add(alternative[1:])
+
+    for line_number, line in enumerate(source, 1):
+        for token in TOKEN.findall(line):
+            if token == '->':
+                if pending is None:
+                    error("'->' without non-terminal")
+                if alternatives is not None and not alternatives:
+                    error('production without alternatives')
+                if initial_simbol is None:
+                    initial_simbol = pending
+                non_terminals.add(pending)
+                alternatives = productions.setdefault(pending, set())
+                pending = None
+                after_separator = True
+            elif token == '|':
+                if pending is None:
+                    error('empty alternative')
+                add(pending)
+                pending = None
+                after_separator = True
+            else:
+                if pending is not None:
+                    add(pending)
+                pending = token
+                separated = after_separator
+                after_separator = False
 
-        productionDict = dict()
+    if pending is None:
+        error('grammar ends without an alternative' if initial_simbol is not None else 'empty grammar')
+    add(pending)
 
-        grammar_length = len(grammar)
+    return regular_grammar(non_terminals, terminals, productions, initial_simbol)
 
-        for i in range(0, grammar_length):
-            if grammar[i].isupper():
-                non_terminals.add(grammar[i])
 
-            if not grammar[i] == '|' and not grammar[i] == '->' and not i == 0 and not grammar[i].isupper():
-                temporary_beta.add(grammar[i])
-                terminals.add(grammar[i][0])
+def read_grammar(path, encoding='utf-8'):
+    """
+    :param path: file with the grammar, read line by line
+    :param encoding: {str} text encoding of the file
+    :return: {regular_grammar}
+    """
+    with open(path, encoding=encoding) as grammar_file:
+        return parse_grammar(grammar_file)
 
-            if grammar[i] == '->' or i == grammar_length - 1:
-                if len(temporary_beta) > 0:
-                    productionDict[temporary_alfa] = temporary_beta
 
-                temporary_beta = set()
-                temporary_alfa = grammar[i-1]
+def make_it_proper_to_grammar(transitions_str):
+    """
+    :param transitions_str: {string} grammar
+    :return: {regular_grammar}
+    """
+    return parse_grammar(transitions_str)
 
-        return regular_grammar(non_terminals, terminals, productionDict, initial_simbol)
 
 class regular_grammar:
     
@@ -43,26 +110,55 @@ class regular_grammar:
         
     def to_automata(self):
         """
-        :return: productions of automata
+        :return: productions of automata, alternatives without non-terminal go to 'qAccept'
         """
-        states = self.non_terminals
-        states.add('qAccept')
         delta = dict()
-        temp = dict()
 
         for _alfa in self.productions:
+            temp = dict()
             for _beta in self.productions[_alfa]:
-                if _beta[0] in temp:
-                    if len(_beta) == 2:
-                        temp[_beta[0]].add(_beta[1])
-                    else:
-                        temp[_beta[0]].add('qAccept')
-                else:
-                    if len(_beta) == 2:
-                        temp[_beta[0]] = {_beta[1]}
-                    else:
-                        temp[_beta[0]] = {'qAccept'}
+                temp.setdefault(_beta[0], set()).add(_beta[1:] if len(_beta) > 1 else ACCEPT)
             delta[_alfa] = temp
-            temp = dict()
 
-        return delta
\ No newline at end of file
+        return delta
+
+    def compile(self, minimize=True):
+        """Builds the integer-table DFA of the grammar straight from the productions:
+        non-terminals are numbered as NDFA states in order of appearance, the
+        alternatives fill the bitset table and the subset construction runs on it.
+
+        :param minimize: if True, the table is minimized
+        :return: {CompiledDFA} with integer states
+        """
+        states = []
+        state_index = {}
+
+        def number(_state):
+            if _state not in state_index:
+                state_index[_state] = len(states)
+                states.append(_state)
+            return state_index[_state]
+
+        number(self.initial_simbol)
+        for _alfa in self.productions:
+            number(_alfa)
+        accept = number(ACCEPT)
+
+        edges = [{} for _ in states]
+        epsilon_edges = []
+        accepting = [accept]
+        for _alfa, alternatives in self.productions.items():
+            source = state_index[_alfa]
+            row = edges[source]
+            for _beta in alternatives:
+                if _beta == EPSILON:
+                    accepting.append(source)
+                elif _beta[0] == EPSILON:
+                    epsilon_edges.append((source, number(_beta[1:])))
+                else:
+                    row.setdefault(_beta[0], []).append(number(_beta[1:]) if len(_beta) > 1 else accept)
+
+        table, _ = CompiledNDFA.from_edges(states, edges, epsilon_edges, 0, accepting).determinize()
+        if minimize:
+            table = table.minimize()
+        return table
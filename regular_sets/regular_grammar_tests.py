@@ -1,8 +1,12 @@
-﻿import unittest
+﻿import os
+import shutil
+import tempfile
+import unittest
 
 from regular_sets import regular_grammar
-
-from regular_sets.finite_automaton import NDFA
+from regular_sets.alphabet import OTHER, SymbolRange
+from regular_sets.equivalence import equivalent
+from regular_sets.finite_automaton import DFA, NDFA
 
 
 class RegularGrammarTests(unittest.TestCase):
@@ -28,6 +32,76 @@ class RegularGrammarTests(unittest.TestCase):
 
         regular = dfa.to_grammar()
 
+    def test_compile(self):
+        minimal = self.grammar.compile()
+        table = self.grammar.compile(minimize=False)
+
+        self.assertEqual(3, len(minimal.states))  # a*b*c*
+        for sentence in ['', 'a', 'aabbbbcc', 'cc', 'aaccbb', 'ba', 'abd']:
+            self.assertEqual(table.accepts(sentence), minimal.accepts(sentence))
+        self.assertTrue(minimal.accepts('aabbbbcc'))
+        self.assertFalse(minimal.accepts('aaccbb'))
+        self.assertSetEqual({'S1', 'A', 'B', 'C'}, self.grammar.non_terminals)
+
+    def test_dfa_from_grammar_and_back(self):
+        dfa = DFA.from_grammar(self.grammar)
+        grammar = dfa.to_grammar()
+        ndfa = NDFA(grammar.to_automata(), grammar.initial_simbol, ['qAccept'])
+
+        self.assertTrue(equivalent(dfa, ndfa))
+        self.assertIn('&', grammar.productions[grammar.initial_simbol])
+
+    def test_to_grammar_rejects_labels_that_are_not_characters(self):
+        for label in (SymbolRange('a', 'z'), OTHER, 'ab'):
+            dfa = DFA({'q0': {label: {'q1'}}, 'q1': {}}, 'q0', ['q1'])
+
+            self.assertRaises(ValueError, dfa.to_grammar)
+
+    def test_productions(self):
+        self.assertEqual('S1', self.grammar.initial_simbol)
+        self.assertSetEqual({'S1', 'A', 'B', 'C'}, self.grammar.non_terminals)
+        self.assertSetEqual({'a', 'b', 'c', '&'}, self.grammar.terminals)
+        self.assertSetEqual({'bB', 'bC', 'b'}, self.grammar.productions['B'])
+
+
+class GrammarParserTests(unittest.TestCase):
+    def test_multi_character_non_terminals_and_whitespace(self):
+        grammar = regular_grammar.parse_grammar(['Even ->aOdd|bOdd\n',
+                                                 '\t| &\n',
+                                                 'Odd  ->  aEven\n',
+                                                 '     | bEven | a | b\n'])
+
+        self.assertEqual('Even', grammar.initial_simbol)
+        self.assertSetEqual({'Even', 'Odd'}, grammar.non_terminals)
+        self.assertSetEqual({'aOdd', 'bOdd', '&'}, grammar.productions['Even'])
+
+        ndfa = NDFA(grammar.to_automata(), 'Even', ['qAccept'])
+        self.assertTrue(ndfa.validate_sentence('abab'))
+        self.assertFalse(ndfa.validate_sentence('aba'))
+
+    def test_read_from_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'grammar.txt')
+            with open(path, 'w', encoding='utf-8') as grammar_file:
+                for i in range(100):
+                    grammar_file.write('N%d -> aN%d | b\n' % (i, i + 1))
+                grammar_file.write('N100 -> c\n')
+
+            grammar = regular_grammar.read_grammar(path)
+        finally:
+            shutil.rmtree(directory)
+
+        self.assertEqual(101, len(grammar.productions))
+        self.assertSetEqual({'c'}, grammar.productions['N100'])
+
+    def test_malformed_grammar(self):
+        for text in ['', 'S ->', 'S -> a b', 'S -> | a', 'a S -> b', 'S -> A -> b']:
+            self.assertRaises(ValueError, regular_grammar.parse_grammar, text)
+
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            regular_grammar.parse_grammar('S -> aA\nA -> | b')
+
 
 if __name__ == "__main__":
     unittest.main()
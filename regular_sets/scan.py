@@ -0,0 +1,167 @@
+from collections import deque
+import codecs
+from mmap import ACCESS_READ, mmap as memory_map
+import os
+
+CHUNK_SIZE = 1 << 20
+
+
+def _chunks(source):
+    if isinstance(source, str):
+        return (source,)
+    return source
+
+
+class _Thread:
+    """Match attempt from start. A leading thread has a state of its own; once
+    a thread with an earlier start reaches the same state both have the same
+    future, so the later one follows it from position since on.
+    """
+
+    __slots__ = ('start', 'state', 'end', 'leader', 'since')
+
+    def __init__(self, start, state):
+        self.start = start
+        self.state = state  # None once dead or following
+        self.end = None  # end of the longest match, before since for a follower
+        self.leader = None
+        self.since = None
+
+
+def _leader(thread):
+    """
+    :param thread: {_Thread}
+    :return: {_Thread} leading thread that thread follows, or thread itself;
+        every follower on the way is pointed straight at it
+    """
+    path = []
+    while thread.leader is not None:
+        path.append(thread)
+        thread = thread.leader
+    root = thread
+
+    for follower in reversed(path):  # the leader of each one already follows root
+        leader = follower.leader
+        if leader is not root:
+            if leader.end is not None and leader.end >= follower.since:
+                follower.end = leader.end
+            follower.since = leader.since
+            follower.leader = root
+    return root
+
+
+def _match_end(thread, root):
+    """
+    :param thread: {_Thread} following root directly, or root itself
+    :param root: {_Thread} leading thread, dead
+    :return: {int} end of the longest match from the start of thread, None if there is none
+    """
+    if thread is root or root.end is None or root.end < thread.since:
+        return thread.end
+    return root.end
+
+
+def finditer(engine, source, overlapping=False):
+    """Finds the substrings accepted by the automaton in one forward pass.
+
+    A thread is started at every position and stepped with the input until
+    its state is dead, keeping the end of its longest match so far. Threads
+    in the same state have the same future, so only the one with the
+    earliest start keeps stepping and the others follow it: each symbol
+    costs one step per live state, however many threads there are.
+    Threads are resolved from the leftmost one: a thread whose leader is
+    still running blocks the ones after it, so the input is never read
+    twice and only threads that may still have a match are kept. Empty
+    matches are not reported.
+
+    :param engine: {CompiledDFA} or {CompiledNDFA}
+    :param source: {str} text, or iterable of {str} chunks of one text
+    :param overlapping: if False, leftmost-longest matches that do not overlap;
+        if True, the longest match starting at every position that has one
+    :return: generator of (start, end) spans, in order of start
+    """
+    initial = engine.initial
+    move = engine.move
+    is_dead = engine.is_dead
+    is_accepting = engine.is_accepting
+    if is_dead(initial):
+        return
+
+    live = []  # leading threads still running, in order of start, each in its own state
+    pending = deque()  # threads that may have a match, in order of start
+    floor = 0  # end of the last match reported, when they can't overlap
+    position = 0
+
+    def resolve():
+        nonlocal floor
+        while pending:
+            thread = pending[0]
+            if not overlapping and thread.start < floor:
+                pending.popleft()
+                continue
+            root = _leader(thread)
+            if root.state is not None:
+                break  # its match can still grow
+            pending.popleft()
+            end = _match_end(thread, root)
+            if end is not None:
+                floor = end
+                yield thread.start, end
+
+    for chunk in _chunks(source):
+        for a in chunk:
+            new = _Thread(position, initial)
+            live.append(new)
+            position += 1
+
+            leaders = {}
+            running = []
+            for thread in live:
+                state = move(thread.state, a)
+                thread.state = None
+                if is_dead(state):
+                    continue
+                leader = leaders.get(state)
+                if leader is None:
+                    leaders[state] = thread
+                    thread.state = state
+                    if is_accepting(state):
+                        thread.end = position
+                    running.append(thread)
+                else:
+                    thread.leader = leader
+                    thread.since = position
+            live = running
+
+            if new.state is not None or new.leader is not None:  # alive after its first symbol
+                pending.append(new)
+            if pending:
+                yield from resolve()
+
+    for thread in live:
+        thread.state = None
+    yield from resolve()
+
+
+def read_chunks(path, encoding='utf-8', chunk_size=CHUNK_SIZE):
+    """Memory-maps a file and decodes it chunk by chunk
+    :param path: file to read
+    :param encoding: {str} text encoding of the file
+    :param chunk_size: {int} bytes decoded at a time
+    :return: generator of {str} chunks
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(path, 'rb') as text_file:
+        if os.fstat(text_file.fileno()).st_size == 0:
+            return
+        mapped = memory_map(text_file.fileno(), 0, access=ACCESS_READ)
+        try:
+            for offset in range(0, len(mapped), chunk_size):
+                chunk = decoder.decode(mapped[offset:offset + chunk_size])
+                if chunk:
+                    yield chunk
+            chunk = decoder.decode(b'', final=True)
+            if chunk:
+                yield chunk
+        finally:
+            mapped.close()
@@ -0,0 +1,99 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from regular_sets import fixtures_test, regular_expression, scan
+from regular_sets.finite_automaton import DFA
+
+
+def longest_match(automaton, text, start):
+    ends = [end for end in range(start + 1, len(text) + 1) if automaton.validate_sentence(text[start:end])]
+    return max(ends) if ends else None
+
+
+def brute_force(automaton, text, overlapping):
+    spans = []
+    start = 0
+    while start < len(text):
+        end = longest_match(automaton, text, start)
+        if end is not None:
+            spans.append((start, end))
+        start = end if end is not None and not overlapping else start + 1
+    return spans
+
+
+class CountingEngine:
+    def __init__(self, engine):
+        self.engine = engine
+        self.initial = engine.initial
+        self.is_dead = engine.is_dead
+        self.is_accepting = engine.is_accepting
+        self.moves = 0
+
+    def move(self, state, symbol):
+        self.moves += 1
+        return self.engine.move(state, symbol)
+
+
+class FinditerTests(unittest.TestCase):
+    def setUp(self):
+        # L = (ab)+
+        self.dfa = DFA({'q0': {'a': {'q1'}}, 'q1': {'b': {'q2'}}, 'q2': {'a': {'q1'}}}, 'q0', ['q2'])
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+
+    def test_leftmost_longest(self):
+        self.assertEqual([(1, 5), (7, 9)], list(self.dfa.finditer('xababaxab')))
+        self.assertEqual([(0, 3), (4, 6), (6, 7)], list(self.ndfa.finditer('aaababa')))
+
+    def test_overlapping(self):
+        self.assertEqual([(1, 5), (3, 5), (7, 9)], list(self.dfa.finditer('xababaxab', overlapping=True)))
+
+    def test_chunks(self):
+        chunks = ['xa', 'b', '', 'abax', 'ab']
+
+        self.assertEqual([(1, 5), (7, 9)], list(self.dfa.finditer(iter(chunks))))
+
+    def test_agrees_with_brute_force(self):
+        rng = random.Random(7)
+        automata = [self.dfa, self.ndfa, regular_expression.parse('a(b|c)*a|cc'),
+                    regular_expression.to_dfa('(a|b)*abb')]
+
+        for automaton in automata:
+            for _ in range(50):
+                text = ''.join(rng.choice('abcx') for _ in range(rng.randint(0, 20)))
+                for overlapping in (False, True):
+                    self.assertEqual(brute_force(automaton, text, overlapping),
+                                     list(automaton.finditer(text, overlapping)), text)
+
+    def test_steps_grow_linearly(self):
+        dfa = regular_expression.parse('a(a|b)*c').determinization()
+
+        for automaton in (dfa, dfa.minimize(), regular_expression.parse('a(a|b)*c')):
+            for overlapping in (False, True):
+                engine = CountingEngine(automaton.compile())
+                text = 'ab' * 2000 + 'c'
+
+                spans = list(scan.finditer(engine, text, overlapping))
+
+                self.assertEqual((0, len(text)), spans[0])
+                self.assertLessEqual(engine.moves, (len(engine.engine.states) + 1) * len(text))
+
+    def test_file(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'log.txt')
+            with open(path, 'w', encoding='utf-8') as log:
+                log.write('çab' * 3)
+            empty = os.path.join(directory, 'empty.txt')
+            open(empty, 'w').close()
+
+            self.assertEqual([(1, 3), (4, 6), (7, 9)], list(self.dfa.finditer_file(path)))
+            self.assertEqual([], list(self.dfa.finditer_file(empty)))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
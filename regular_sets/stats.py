@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+import time
+
+
+class AutomatonStats:
+    """Counters, samples and phase timings filled in by the automata.
+
+    Pass an instance as the stats argument of compute, validate_sentence or
+    determinization; without it those methods skip every measurement.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.samples = {}
+        self.phases = {}
+
+    def increment(self, name, amount=1):
+        """
+        :param name: {str} counter
+        :param amount: {int} added to the counter
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def sample(self, name, value):
+        """
+        :param name: {str} series, ex. a queue depth over time
+        :param value: value appended to the series
+        """
+        self.samples.setdefault(name, []).append(value)
+
+    @contextmanager
+    def phase(self, name):
+        """Adds the wall time of the block to the phase
+        :param name: {str} phase
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def reset(self):
+        self.counters.clear()
+        self.samples.clear()
+        self.phases.clear()
+
+    def report(self):
+        """
+        :return: {dict} with counters, phase times in seconds and, per series,
+            its length, maximum and last value
+        """
+        return {
+            'counters': dict(self.counters),
+            'phases': dict(self.phases),
+            'samples': {name: {'count': len(values), 'max': max(values), 'last': values[-1]}
+                        for name, values in self.samples.items() if values},
+        }
+
+
+class _NoPhase:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(stats, name):
+    """
+    :param stats: {AutomatonStats} or None
+    :param name: {str} phase
+    :return: context manager timing the phase, doing nothing when stats is None
+    """
+    if stats is None:
+        return _NO_PHASE
+    return stats.phase(name)
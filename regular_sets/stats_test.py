@@ -0,0 +1,66 @@
+import unittest
+
+from regular_sets import fixtures_test
+from regular_sets.stats import AutomatonStats, phase
+
+
+class AutomatonStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.ndfa = fixtures_test.a_plus_or_ab_plus()
+
+    def test_determinization_stats(self):
+        stats = AutomatonStats()
+
+        dfa = self.ndfa.determinization(stats=stats)
+
+        self.assertEqual(5, stats.counters['determinization.subset_states'])
+        self.assertEqual(6, stats.counters['determinization.transitions'])
+        self.assertEqual(10, stats.counters['determinization.mask_steps'])  # 5 subsets * 2 symbols
+        self.assertEqual(5, len(stats.samples['determinization.queue_depth']))
+        self.assertEqual(5, len(stats.samples['determinization.subset_size']))
+        self.assertEqual({'determinization.compile', 'determinization.subsets', 'determinization.accept_states'},
+                         set(stats.phases))
+        self.assertDictEqual(self.ndfa.determinization().delta, dfa.delta)
+
+    def test_matching_counters(self):
+        stats = AutomatonStats()
+        dfa = fixtures_test.even_length()
+
+        self.assertTrue(dfa.validate_sentence('abab', stats=stats))
+        self.assertFalse(self.ndfa.validate_sentence('aab', stats=stats))
+        self.assertSetEqual({'q3'}, self.ndfa.compute('q0', 'ab', stats=stats))
+
+        self.assertEqual(2, stats.counters['validate_sentence.calls'])
+        self.assertEqual(7, stats.counters['validate_sentence.symbols'])
+        self.assertEqual(1, stats.counters['validate_sentence.accepted'])
+        self.assertEqual(1, stats.counters['compute.calls'])
+        self.assertEqual(2, stats.counters['compute.symbols'])
+
+    def test_symbols_read_before_stopping(self):
+        stats = AutomatonStats()
+
+        self.assertFalse(self.ndfa.validate_sentence('abbaaaaa', stats=stats))  # dead after 'abb'
+        self.assertTrue(self.ndfa.validate_sentence(iter('aaa'), stats=stats))
+        self.assertSetEqual(set(), self.ndfa.compute('q0', 'ba', stats=stats))
+
+        self.assertEqual(6, stats.counters['validate_sentence.symbols'])
+        self.assertEqual(1, stats.counters['compute.symbols'])
+
+    def test_report_and_disabled_phase(self):
+        stats = AutomatonStats()
+        with phase(stats, 'work'):
+            stats.sample('depth', 3)
+            stats.sample('depth', 1)
+        with phase(None, 'work'):
+            pass
+
+        report = stats.report()
+
+        self.assertIn('work', report['phases'])
+        self.assertDictEqual({'count': 2, 'max': 3, 'last': 1}, report['samples']['depth'])
+        stats.reset()
+        self.assertDictEqual({'counters': {}, 'phases': {}, 'samples': {}}, stats.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+try:
+    import numpy
+except ImportError:  # numpy is optional, only the batch evaluator needs it
+    numpy = None
+
+from regular_sets.compiled_automaton import CompiledDFA
+
+
+class BatchEvaluator:
+    """Validates many sentences against one DFA with NumPy.
+
+    The compiled transition table is kept as a 2-d array with an extra
+    column for the symbols no state has a transition for, which go to the
+    dead state. A batch is encoded into a padded matrix of columns by
+    searching the code points among the bounds of the symbol classes, sorted
+    by length, and every character position advances all the sentences still
+    running with one gather.
+    """
+
+    def __init__(self, dfa):
+        """BatchEvaluator Constructor
+        :param dfa: {DFA} automaton to validate against
+        """
+        if numpy is None:
+            raise ImportError('BatchEvaluator needs numpy')
+
+        compiled = dfa._engine()
+        if not isinstance(compiled, CompiledDFA):
+            raise TypeError('BatchEvaluator needs a DFA, determinize the NDFA first')
+
+        classes = compiled.classes
+        width = classes.count
+        table = numpy.array(compiled.table, dtype=numpy.intp).reshape(compiled.dead + 1, width)
+        other = numpy.full((compiled.dead + 1, 1), compiled.dead, dtype=numpy.intp)
+        self.table = numpy.hstack([table, other])
+        self.accepting = numpy.frombuffer(bytes(compiled.accepting), dtype=numpy.uint8).astype(bool)
+        self.initial = compiled.initial
+        self.other = width
+
+        # only single characters can be read from a string
+        self.boundaries = numpy.array(classes.boundaries, dtype=numpy.uint32)
+        self.columns = numpy.array([width if column is None else column for column in classes.columns],
+                                   dtype=numpy.intp)
+
+    def encode(self, sentences):
+        """
+        :param sentences: {list} of {str}
+        :return: {tuple} (matrix of columns padded with the 'other' column, lengths)
+        """
+        lengths = numpy.array([len(sentence) for sentence in sentences], dtype=numpy.intp)
+        longest = int(lengths.max()) if len(sentences) else 0
+        if longest == 0:
+            return numpy.zeros((len(sentences), 0), dtype=numpy.intp), lengths
+
+        text = numpy.array(sentences, dtype='<U%d' % longest)
+        points = text.view(numpy.uint32).reshape(len(sentences), longest)
+
+        interval = numpy.searchsorted(self.boundaries, points, side='right') - 1
+        return self.columns[interval], lengths
+
+    def validate(self, sentences):
+        """
+        :param sentences: iterable of {str} sentences to validate
+        :return: {numpy.ndarray} of bool, one per sentence, in order
+        """
+        sentences = list(sentences)
+        matrix, lengths = self.encode(sentences)
+
+        order = numpy.argsort(-lengths, kind='stable')
+        matrix = matrix[order]
+        running = numpy.searchsorted(-lengths[order], -numpy.arange(1, matrix.shape[1] + 1), side='right')
+
+        table = self.table
+        states = numpy.full(len(sentences), self.initial, dtype=numpy.intp)
+        for position in range(matrix.shape[1]):
+            count = running[position]  # sentences longer than position, first after sorting
+            states[:count] = table[states[:count], matrix[:count, position]]
+
+        result = numpy.empty(len(sentences), dtype=bool)
+        result[order] = self.accepting[states]
+        return result
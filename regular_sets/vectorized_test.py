@@ -0,0 +1,42 @@
+import itertools
+import unittest
+
+from regular_sets import fixtures_test, vectorized
+from regular_sets.finite_automaton import NDFA
+
+
+@unittest.skipIf(vectorized.numpy is None, 'numpy is not installed')
+class BatchEvaluatorTests(unittest.TestCase):
+    def setUp(self):
+        self.dfa = fixtures_test.ends_with_b()
+
+    def test_matches_validate_sentence(self):
+        sentences = [''.join(w) for n in range(6) for w in itertools.product('abc', repeat=n)]
+        evaluator = vectorized.BatchEvaluator(self.dfa)
+
+        result = evaluator.validate(sentences)
+
+        self.assertEqual(len(sentences), len(result))
+        self.assertEqual([self.dfa.validate_sentence(s) for s in sentences], result.tolist())
+
+    def test_determinized_dfa_and_unicode(self):
+        ndfa = NDFA({'q0': {'a': {'q0', 'q1'}, 'ç': {'q0'}}, 'q1': {'b': {'q2'}}}, 'q0', ['q2'])
+        evaluator = vectorized.BatchEvaluator(ndfa.determinization())
+
+        self.assertEqual([True, True, False, False, False],
+                         evaluator.validate(['ab', 'çaab', 'aç', '€ab', '']).tolist())
+
+    def test_empty_batch(self):
+        evaluator = vectorized.BatchEvaluator(self.dfa)
+
+        self.assertEqual(0, len(evaluator.validate([])))
+        self.assertEqual([False, False], evaluator.validate(['', '']).tolist())
+
+    def test_rejects_ndfa(self):
+        ndfa = NDFA({'q0': {'a': {'q0', 'q1'}}}, 'q0', ['q1'])
+
+        self.assertRaises(TypeError, vectorized.BatchEvaluator, ndfa)
+
+
+if __name__ == '__main__':
+    unittest.main()